@@ -2,12 +2,20 @@
 
 import json
 import time
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, TypedDict
 
 import requests
 
 
+class DiscoveryStats(TypedDict):
+    """Counts from a tracked games update."""
+
+    added: int
+    skipped: int
+
+
 class GameDiscovery:
     """Discovers and tracks popular games using SteamSpy API."""
 
@@ -34,9 +42,8 @@ class GameDiscovery:
             return {}
 
         try:
-            with open(self.config_path) as f:
-                data = json.load(f)
-                return {int(app_id): name for app_id, name in data.items()}
+            data = json.loads(self.config_path.read_text(encoding="utf-8"))
+            return {int(app_id): name for app_id, name in data.items()}
         except (json.JSONDecodeError, ValueError) as e:
             print(f"Error loading games config: {e}")
             return {}
@@ -53,8 +60,10 @@ class GameDiscovery:
         # Convert int keys to strings for JSON
         games_str = {str(app_id): name for app_id, name in games.items()}
 
-        with open(self.config_path, "w") as f:
-            json.dump(games_str, f, indent=2, ensure_ascii=False)
+        # Serialize in one go and write once; json.dump issues a write per token
+        self.config_path.write_text(
+            json.dumps(games_str, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
 
         print(f"✅ Saved {len(games)} tracked games to {self.config_path}")
 
@@ -79,7 +88,8 @@ class GameDiscovery:
 
             # SteamSpy returns dict with app_id as keys
             discovered = {}
-            for app_id_str, game_data in list(data.items())[:limit]:
+            # Take the first N entries without copying the whole response into a list
+            for app_id_str, game_data in islice(data.items(), limit):
                 try:
                     app_id = int(app_id_str)
                     name = game_data.get("name", f"Game {app_id}")
@@ -183,7 +193,7 @@ class GameDiscovery:
         top_limit: int = 100,
         trending_limit: int = 50,
         delay: float = 1.0,
-    ) -> dict[int, str]:
+    ) -> tuple[dict[int, str], DiscoveryStats]:
         """Update tracked games list by discovering new games (append-only).
 
         This method only adds new games to the list, never removes existing ones.
@@ -197,12 +207,14 @@ class GameDiscovery:
             delay: Delay between API calls in seconds (rate limiting)
 
         Returns:
-            Updated dictionary of all tracked games
+            Tuple of (updated dictionary of all tracked games, DiscoveryStats with the
+            number of discovered games added and skipped as already tracked)
         """
         # Load current tracked games
         tracked = self.load_tracked_games()
         initial_count = len(tracked)
         print(f"📊 Currently tracking {initial_count} games")
+        stats = DiscoveryStats(added=0, skipped=0)
 
         # Discover top games by playtime
         if include_top:
@@ -210,12 +222,9 @@ class GameDiscovery:
             top_games = self.discover_top_games(limit=top_limit)
 
             # Add new games (append-only)
-            new_from_top = 0
-            for app_id, name in top_games.items():
-                if app_id not in tracked:
-                    tracked[app_id] = name
-                    new_from_top += 1
-                    print(f"  ➕ Added: {name} (app_id: {app_id})")
+            new_from_top = self._add_new_games(tracked, top_games)
+            stats["added"] += new_from_top
+            stats["skipped"] += len(top_games) - new_from_top
 
             print(f"✅ Added {new_from_top} new games from top by playtime")
             time.sleep(delay)  # Rate limiting
@@ -226,12 +235,9 @@ class GameDiscovery:
             trending_games = self.discover_trending_games(limit=trending_limit)
 
             # Add new games (append-only)
-            new_from_trending = 0
-            for app_id, name in trending_games.items():
-                if app_id not in tracked:
-                    tracked[app_id] = name
-                    new_from_trending += 1
-                    print(f"  ➕ Added: {name} (app_id: {app_id})")
+            new_from_trending = self._add_new_games(tracked, trending_games)
+            stats["added"] += new_from_trending
+            stats["skipped"] += len(trending_games) - new_from_trending
 
             print(f"✅ Added {new_from_trending} new games from trending")
             time.sleep(delay)  # Rate limiting
@@ -242,12 +248,9 @@ class GameDiscovery:
             featured_games = self.discover_featured_games()
 
             # Add new games (append-only)
-            new_from_featured = 0
-            for app_id, name in featured_games.items():
-                if app_id not in tracked:
-                    tracked[app_id] = name
-                    new_from_featured += 1
-                    print(f"  ➕ Added: {name} (app_id: {app_id})")
+            new_from_featured = self._add_new_games(tracked, featured_games)
+            stats["added"] += new_from_featured
+            stats["skipped"] += len(featured_games) - new_from_featured
 
             print(f"✅ Added {new_from_featured} new games from featured")
             time.sleep(delay)  # Rate limiting
@@ -259,4 +262,20 @@ class GameDiscovery:
         print(f"\n📈 Total tracked games: {initial_count} → {final_count} (+{new_total})")
         self.save_tracked_games(tracked)
 
-        return tracked
+        return tracked, stats
+
+    @staticmethod
+    def _add_new_games(tracked: dict[int, str], games: dict[int, str]) -> int:
+        """Add games not tracked yet to ``tracked`` in place.
+
+        Args:
+            tracked: Currently tracked games, updated in place
+            games: Newly discovered games
+
+        Returns:
+            Number of games added
+        """
+        before = len(tracked)
+        for app_id, name in games.items():
+            tracked.setdefault(app_id, name)
+        return len(tracked) - before
@@ -65,6 +65,9 @@ class IGDBCollector:
         self.access_token: str | None = None
         self.token_expires_at: float = 0
 
+        # Reuse connections (and their TLS handshakes) across API calls
+        self.session = requests.Session()
+
     def _get_access_token(self) -> str:
         """Get OAuth2 access token for IGDB API."""
         if self.access_token and time.time() < (self.token_expires_at - 300):
@@ -76,7 +79,7 @@ class IGDBCollector:
             "grant_type": "client_credentials",
         }
 
-        response = requests.post(self.AUTH_URL, params=params, timeout=self.TIMEOUT_SECONDS)
+        response = self.session.post(self.AUTH_URL, params=params, timeout=self.TIMEOUT_SECONDS)
         response.raise_for_status()
 
         data = response.json()
@@ -96,7 +99,7 @@ class IGDBCollector:
 
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
+                response = self.session.post(
                     url, headers=headers, data=query, timeout=self.TIMEOUT_SECONDS
                 )
                 response.raise_for_status()
@@ -554,3 +557,15 @@ class IGDBCollector:
         print(f"\n✅ Enriched {len(enriched_games)}/{len(discovered)} games")
 
         return enriched_games
+
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
+
+    def __enter__(self) -> "IGDBCollector":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit - releases pooled connections."""
+        self.close()
@@ -1,12 +1,15 @@
 """Steam API collector for player count data."""
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import requests
 
+from python.utils.rate_limiter import TokenBucket
+
 
 class SteamCollector:
     """Collector for Steam API player statistics."""
@@ -191,6 +194,54 @@ class SteamCollector:
 
         return results
 
+    def collect_top_games_parallel(
+        self,
+        limit: int | None = None,
+        include_kpis: bool = True,
+        workers: int = 8,
+        delay: float = 1.0,
+    ) -> list[dict[str, Any]]:
+        """
+        Collect player data and KPIs for tracked games concurrently.
+
+        Same as collect_top_games(), but requests for different games are issued
+        from a thread pool so that network latency overlaps instead of adding up.
+        When fetching KPIs, games still start at least ``delay`` seconds apart,
+        so the Store API sees the same request rate as the sequential path.
+
+        Args:
+            limit: Number of games to collect. If None, collects all tracked games.
+            include_kpis: If True, also collect Metacritic, price from Store API
+            workers: Maximum number of concurrent requests
+            delay: Minimum delay in seconds between game starts (only if include_kpis=True)
+
+        Returns:
+            List of game data dictionaries in tracked order (skips games with errors)
+        """
+        game_ids = list(self._tracked_games.keys())
+
+        if limit is not None:
+            game_ids = game_ids[:limit]
+
+        # Rate limiting when fetching KPIs (to avoid Steam Store API throttling);
+        # a one-token bucket spaces starts by delay across all worker threads
+        limiter = TokenBucket(capacity=1, period=delay) if include_kpis and delay > 0 else None
+
+        def fetch(app_id: int) -> dict[str, Any] | None:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return self.get_game_data(app_id, include_kpis=include_kpis)
+            except Exception as e:
+                game_name = self._tracked_games.get(app_id, f"Game {app_id}")
+                print(f"⚠️  Skipping {game_name} (ID: {app_id}): {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, game_ids))
+
+        return [game_data for game_data in results if game_data is not None]
+
     def get_top_games(self) -> dict[int, str]:
         """
         Get the dictionary of tracked games.
@@ -1,33 +1,81 @@
 """Steam Store API collector for game metadata."""
 
+import copy
+import operator
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from python.models.game_metadata import GameMetadata
+from python.utils.rate_limiter import TokenBucket
+
+# Description of a genre/category entry, looked up in C; keeps "" for entries without one
+_DESCRIPTION = operator.methodcaller("get", "description", "")
 
 
 class SteamStoreCollector:
     """Collects game metadata from Steam Store and SteamSpy APIs."""
 
-    def __init__(self) -> None:
-        """Initialize Steam Store collector."""
-        self.store_api_base = "https://store.steampowered.com/api/appdetails"
-        self.steamspy_api_base = "https://steamspy.com/api.php"
+    store_api_base = "https://store.steampowered.com/api/appdetails"
+    steamspy_api_base = "https://steamspy.com/api.php"
+    TIMEOUT_SECONDS = 10
+
+    def __init__(self, cache_ttl: float = 24 * 60 * 60) -> None:
+        """Initialize Steam Store collector.
+
+        Args:
+            cache_ttl: Seconds to reuse fetched details and tags of an app (0 disables caching)
+        """
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Gaming-Data-Observatory/1.0"})
 
-    def get_game_details(self, app_id: int) -> dict[str, Any] | None:
+        # Keep connections to both hosts alive across games and worker threads, and
+        # retry transient errors; exhausted retries return the last response as before
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        self.session.mount("https://", adapter)
+
+        # Store metadata changes over days, so repeated lookups are served from memory:
+        # (endpoint, app_id) -> (expiry on the monotonic clock, response)
+        self.cache_ttl = cache_ttl
+        self._cache: dict[tuple[str, int], tuple[float, Any]] = {}
+
+        # SteamSpy tag lookups run here while the Store request runs in the calling thread;
+        # kept apart from collect_top_games_metadata's pool so nested submits cannot deadlock
+        self._tags_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="steamspy")
+
+        # Published request budgets; waiting for a token is far cheaper than 429 backoff
+        self.store_limiter = TokenBucket(capacity=200, period=5 * 60)
+        self.steamspy_limiter = TokenBucket(capacity=60, period=60)
+
+    def get_game_details(self, app_id: int) -> GameMetadata | None:
         """Get game details from Steam Store API.
 
         Args:
             app_id: Steam application ID
 
         Returns:
-            Dictionary with game details or None if failed
+            GameMetadata with game details (no tags yet) or None if failed
         """
+        cached = self._cache_get("details", app_id)
+        if cached is not None:
+            return cached
+
         try:
             params: dict[str, Any] = {"appids": app_id, "l": "english"}
-            response = self.session.get(self.store_api_base, params=params, timeout=10)
+            self.store_limiter.acquire()
+            response = self.session.get(
+                self.store_api_base, params=params, timeout=self.TIMEOUT_SECONDS
+            )
 
             if response.status_code != 200:
                 return None
@@ -39,24 +87,27 @@ class SteamStoreCollector:
                 return None
 
             game_data = app_data["data"]
-
-            return {
-                "app_id": app_id,
-                "name": game_data.get("name", ""),
-                "type": game_data.get("type", ""),
-                "description": game_data.get("short_description", ""),
-                "developers": game_data.get("developers", []),
-                "publishers": game_data.get("publishers", []),
-                "is_free": game_data.get("is_free", False),
-                "required_age": game_data.get("required_age", 0),
-                "release_date": game_data.get("release_date", {}).get("date", ""),
-                "platforms": self._extract_platforms(game_data),
-                "metacritic_score": game_data.get("metacritic", {}).get("score"),
-                "metacritic_url": game_data.get("metacritic", {}).get("url"),
-                "categories": self._extract_categories(game_data),
-                "genres": self._extract_genres(game_data),
-                "price_info": self._parse_price(game_data),
-            }
+            metacritic = game_data.get("metacritic") or {}
+
+            details = GameMetadata(
+                app_id=app_id,
+                name=game_data.get("name", ""),
+                type=game_data.get("type", ""),
+                description=game_data.get("short_description", ""),
+                developers=game_data.get("developers", []),
+                publishers=game_data.get("publishers", []),
+                is_free=game_data.get("is_free", False),
+                required_age=game_data.get("required_age", 0),
+                release_date=game_data.get("release_date", {}).get("date", ""),
+                platforms=self._extract_platforms(game_data),
+                metacritic_score=metacritic.get("score"),
+                metacritic_url=metacritic.get("url"),
+                categories=self._extract_categories(game_data),
+                genres=self._extract_genres(game_data),
+                price_info=self._parse_price(game_data),
+            )
+            self._cache_put("details", app_id, details)
+            return details
 
         except (requests.RequestException, ValueError, KeyError) as e:
             print(f"Error fetching game details for {app_id}: {e}")
@@ -71,71 +122,120 @@ class SteamStoreCollector:
         Returns:
             Dictionary of tags with their scores
         """
+        cached = self._cache_get("tags", app_id)
+        if cached is not None:
+            return cached
+
         try:
             params: dict[str, Any] = {"request": "appdetails", "appid": app_id}
-            response = self.session.get(self.steamspy_api_base, params=params, timeout=10)
+            self.steamspy_limiter.acquire()
+            response = self.session.get(
+                self.steamspy_api_base, params=params, timeout=self.TIMEOUT_SECONDS
+            )
 
             if response.status_code != 200:
                 return {}
 
             data = response.json()
             tags: dict[str, int] = data.get("tags", {})
+            if tags:
+                self._cache_put("tags", app_id, tags)
             return tags
 
         except (requests.RequestException, ValueError, KeyError) as e:
             print(f"Error fetching tags for {app_id}: {e}")
             return {}
 
-    def collect_full_metadata(self, app_id: int) -> dict[str, Any] | None:
+    def collect_full_metadata(self, app_id: int) -> GameMetadata | None:
         """Collect full metadata including details and tags.
 
         Args:
             app_id: Steam application ID
 
         Returns:
-            Dictionary with complete metadata or None if failed
+            GameMetadata with complete metadata or None if failed
         """
+        # Store and SteamSpy are independent hosts, so fetch tags concurrently
+        tags_future = self._tags_executor.submit(self.get_game_tags, app_id)
+
         details = self.get_game_details(app_id)
         if not details:
+            tags_future.cancel()
             return None
 
         # Add tags from SteamSpy
-        tags = self.get_game_tags(app_id)
-        details["tags"] = tags
+        details.tags = tags_future.result()
 
         # Add collection timestamp
-        details["collected_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        details.collected_at = time.strftime("%Y-%m-%d %H:%M:%S")
 
         return details
 
     def collect_top_games_metadata(
-        self, game_ids: list[int], delay: float = 1.5
-    ) -> list[dict[str, Any]]:
+        self, game_ids: list[int], delay: float = 1.5, workers: int = 4
+    ) -> list[GameMetadata]:
         """Collect metadata for multiple games.
 
+        Games are still started ``delay`` seconds apart, but each one is fetched on a
+        thread pool, so its requests overlap the wait before the next game instead of
+        adding to it.
+
         Args:
             game_ids: List of Steam application IDs
-            delay: Delay between API calls in seconds (rate limiting)
+            delay: Delay between starting games in seconds (rate limiting)
+            workers: Maximum number of games fetched concurrently
 
         Returns:
-            List of metadata dictionaries
+            List of GameMetadata in game_ids order
         """
-        metadata_list = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for i, app_id in enumerate(game_ids):
+                if i > 0:
+                    # Rate limiting to avoid overwhelming the APIs
+                    time.sleep(delay)
+
+                print(f"Collecting metadata for app {app_id}...")
+                futures.append(executor.submit(self.collect_full_metadata, app_id))
+
+            metadata_list = []
+            for app_id, future in zip(game_ids, futures, strict=True):
+                metadata = future.result()
+
+                if metadata:
+                    metadata_list.append(metadata)
+                    print(f"✅ Collected metadata for {metadata.name}")
+                else:
+                    print(f"❌ Failed to collect metadata for app {app_id}")
+
+        return metadata_list
 
-        for app_id in game_ids:
-            print(f"Collecting metadata for app {app_id}...")
-            metadata = self.collect_full_metadata(app_id)
+    def _cache_get(self, endpoint: str, app_id: int) -> Any:
+        """Return a copy of a cached response, or None if missing or expired.
 
-            if metadata:
-                metadata_list.append(metadata)
-                print(f"✅ Collected metadata for {metadata['name']}")
-            else:
-                print(f"❌ Failed to collect metadata for app {app_id}")
+        Args:
+            endpoint: Cache namespace ("details" or "tags")
+            app_id: Steam application ID
 
-            # Rate limiting to avoid overwhelming the APIs
-            time.sleep(delay)
+        Returns:
+            Cached GameMetadata or tags dictionary, or None
+        """
+        entry = self._cache.get((endpoint, app_id))
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        # Callers fill in the returned record (e.g. tags, collected_at)
+        return copy.copy(entry[1])
 
-        return metadata_list
+    def _cache_put(self, endpoint: str, app_id: int, value: Any) -> None:
+        """Cache a copy of a successful response for cache_ttl seconds.
+
+        Args:
+            endpoint: Cache namespace ("details" or "tags")
+            app_id: Steam application ID
+            value: Response to cache
+        """
+        if self.cache_ttl > 0:
+            self._cache[(endpoint, app_id)] = (time.monotonic() + self.cache_ttl, copy.copy(value))
 
     def _extract_platforms(self, game_data: dict[str, Any]) -> list[str]:
         """Extract supported platforms from game data.
@@ -158,8 +258,7 @@ class SteamStoreCollector:
         Returns:
             List of genre names
         """
-        genres_data = game_data.get("genres", [])
-        return [genre.get("description", "") for genre in genres_data]
+        return list(map(_DESCRIPTION, game_data.get("genres") or ()))
 
     def _extract_categories(self, game_data: dict[str, Any]) -> list[str]:
         """Extract categories from game data.
@@ -170,8 +269,7 @@ class SteamStoreCollector:
         Returns:
             List of category names
         """
-        categories_data = game_data.get("categories", [])
-        return [cat.get("description", "") for cat in categories_data]
+        return list(map(_DESCRIPTION, game_data.get("categories") or ()))
 
     def _parse_price(self, game_data: dict[str, Any]) -> dict[str, Any]:
         """Parse price information from game data.
@@ -195,3 +293,16 @@ class SteamStoreCollector:
             "is_free": False,
             "discount": price_overview.get("discount_percent", 0),
         }
+
+    def close(self) -> None:
+        """Stop the SteamSpy tag workers and close the HTTP session."""
+        self._tags_executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self) -> "SteamStoreCollector":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit - releases threads and connections."""
+        self.close()
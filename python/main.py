@@ -38,10 +38,17 @@ def collect() -> None:
 @click.option(
     "--kpi-delay",
     default=1.5,
-    help="Delay between API requests in seconds (rate limiting)",
+    help="Minimum delay between games' API requests in seconds (rate limiting)",
     type=float,
 )
-def steam(limit: int | None, db_path: str, kpi_delay: float) -> None:
+@click.option(
+    "--workers",
+    "-w",
+    default=8,
+    help="Number of games to collect concurrently (1 = sequential)",
+    type=int,
+)
+def steam(limit: int | None, db_path: str, kpi_delay: float, workers: int) -> None:
     """Collect Steam KPIs for tracked games.
 
     Collects temporal KPIs: CCU, Metacritic scores, prices, is_free status.
@@ -67,7 +74,14 @@ def steam(limit: int | None, db_path: str, kpi_delay: float) -> None:
         click.echo("   • Prices\n")
 
         # Collect all KPIs (CCU + Metacritic + Price)
-        games_data = collector.collect_top_games(limit=limit, include_kpis=True, delay=kpi_delay)
+        if workers > 1:
+            games_data = collector.collect_top_games_parallel(
+                limit=limit, include_kpis=True, workers=workers, delay=kpi_delay
+            )
+        else:
+            games_data = collector.collect_top_games(
+                limit=limit, include_kpis=True, delay=kpi_delay
+            )
 
         click.echo(f"\n✅ Collected KPIs for {len(games_data)} games")
 
@@ -309,7 +323,20 @@ def twitch(limit: int | None, db_path: str, delay: float) -> None:
     help="Path to DuckDB database",
     type=click.Path(),
 )
-def all(limit: int | None, db_path: str) -> None:
+@click.option(
+    "--kpi-delay",
+    default=1.5,
+    help="Minimum delay between Steam games' API requests in seconds (rate limiting)",
+    type=float,
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=8,
+    help="Number of Steam games to collect concurrently (1 = sequential)",
+    type=int,
+)
+def all(limit: int | None, db_path: str, kpi_delay: float, workers: int) -> None:
     """Collect all KPIs from all sources (orchestrator).
 
     Runs all collection commands in sequence:
@@ -340,7 +367,14 @@ def all(limit: int | None, db_path: str) -> None:
     click.echo("-" * 60)
     try:
         collector = SteamCollector(db_path=db_path_obj)
-        games_data = collector.collect_top_games(limit=limit, include_kpis=True, delay=1.5)
+        if workers > 1:
+            games_data = collector.collect_top_games_parallel(
+                limit=limit, include_kpis=True, workers=workers, delay=kpi_delay
+            )
+        else:
+            games_data = collector.collect_top_games(
+                limit=limit, include_kpis=True, delay=kpi_delay
+            )
 
         if games_data:
             with DuckDBManager(db_path=db_path_obj) as db:
@@ -741,26 +775,30 @@ def store(db_path: str, parquet_path: str) -> None:
 
     try:
         with DuckDBManager(db_path=db_path_obj) as db:
+            parquet_pattern = str(parquet_path_obj / "**" / "*.parquet")
+
             # Create table from Parquet schema if it doesn't exist
             # Note: Uses steam_kpis instead of steam_raw
-            db.query(
+            db.conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS steam_kpis AS
-                SELECT * FROM read_parquet('data/raw/steam/**/*.parquet')
-            """
+                SELECT * FROM read_parquet(?) LIMIT 0
+            """,
+                [parquet_pattern],
             )
 
             # Insert new data (avoiding duplicates)
-            db.query(
+            db.conn.execute(
                 """
                 INSERT INTO steam_kpis
-                SELECT * FROM read_parquet('data/raw/steam/**/*.parquet')
+                SELECT * FROM read_parquet(?)
                 WHERE NOT EXISTS (
                     SELECT 1 FROM steam_kpis s
                     WHERE s.timestamp = read_parquet.timestamp
                     AND s.steam_app_id = read_parquet.steam_app_id
                 )
-            """
+            """,
+                [parquet_pattern],
             )
 
             # Get stats
@@ -0,0 +1,35 @@
+"""Game metadata record collected from Steam Store and SteamSpy."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class GameMetadata:
+    """Metadata of one Steam game; use ``to_dict()`` to serialize."""
+
+    app_id: int
+    name: str = ""
+    type: str = ""
+    description: str = ""
+    developers: list[str] = field(default_factory=list)
+    publishers: list[str] = field(default_factory=list)
+    is_free: bool = False
+    required_age: int = 0
+    release_date: str = ""
+    platforms: list[str] = field(default_factory=list)
+    metacritic_score: int | None = None
+    metacritic_url: str | None = None
+    categories: list[str] = field(default_factory=list)
+    genres: list[str] = field(default_factory=list)
+    price_info: dict[str, Any] = field(default_factory=dict)
+    tags: dict[str, int] = field(default_factory=dict)
+    collected_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the record as a plain dictionary.
+
+        Returns:
+            Dictionary with one key per field
+        """
+        return asdict(self)
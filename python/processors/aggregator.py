@@ -3,25 +3,63 @@
 from datetime import datetime, timedelta
 from pathlib import Path
 from types import TracebackType
+from typing import Any
 
 from python.storage.duckdb_manager import DuckDBManager
+from python.storage.export_cache import ExportCache
+
+# Steam rankings over the whole daily history; materialized as steam_rankings
+_STEAM_RANKINGS_SQL = """
+    SELECT
+        game_name,
+        steam_app_id,
+        igdb_id,
+        AVG(peak_ccu) as avg_peak_ccu,
+        MAX(peak_ccu) as all_time_peak_ccu,
+        AVG(avg_ccu) as avg_ccu,
+        AVG(avg_metacritic_score) as avg_metacritic_score,
+        MAX(avg_metacritic_score) as latest_metacritic_score,
+        AVG(avg_price_cents) as avg_price_cents,
+        COUNT(DISTINCT date) as days_tracked
+    FROM steam_daily_kpis
+    GROUP BY game_name, steam_app_id, igdb_id
+"""
 
 
 class KPIAggregator:
     """Aggregates raw Steam data into daily KPIs and exports for dashboards."""
 
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        export_cache_dir: Path | None = None,
+        read_only: bool = False,
+        db_config: dict[str, Any] | None = None,
+    ):
         """Initialize the KPI aggregator.
 
         Args:
             db_path: Path to the DuckDB database file
+            export_cache_dir: Optional directory for caching JSON exports
+                              between runs on an unchanged database
+            read_only: Open the database read-only (exports only, no aggregation)
+            db_config: Optional DuckDB settings passed to the connection
         """
         self.db_path = db_path
+        self.export_cache_dir = export_cache_dir
+        self.read_only = read_only
+        self.db_config = db_config
         self.db_manager: DuckDBManager | None = None
 
     def __enter__(self) -> "KPIAggregator":
         """Context manager entry."""
-        self.db_manager = DuckDBManager(db_path=self.db_path)
+        export_cache = ExportCache(self.export_cache_dir) if self.export_cache_dir else None
+        self.db_manager = DuckDBManager(
+            db_path=self.db_path,
+            export_cache=export_cache,
+            read_only=self.read_only,
+            config=self.db_config,
+        )
         self.db_manager.__enter__()
         return self
 
@@ -202,6 +240,39 @@ class KPIAggregator:
         self.create_steam_daily_kpis()
         self.create_twitch_daily_kpis()
         self.create_igdb_ratings_snapshot()
+        self.create_steam_rankings()
+
+    def create_steam_rankings(self) -> None:
+        """Materialize Steam game rankings from steam_daily_kpis.
+
+        Rankings are rebuilt once per aggregation run so that exports read a
+        small pre-aggregated table instead of re-scanning the whole daily
+        history on every export.
+        """
+        if not self.db_manager:
+            return
+
+        self.db_manager.query(f"CREATE OR REPLACE TABLE steam_rankings AS {_STEAM_RANKINGS_SQL}")
+
+    def _steam_rankings_source(self) -> str:
+        """Return the relation Steam rankings exports should read from.
+
+        Databases aggregated before steam_rankings existed don't have the table
+        yet: it is created on the spot when the database is writable, and
+        read-only exports fall back to computing the rankings inline.
+
+        Returns:
+            Table name or parenthesized subquery for use in a FROM clause
+        """
+        assert self.db_manager is not None
+        exists = self.db_manager.scalar(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'steam_rankings'"
+        )
+        if not exists:
+            if self.read_only:
+                return f"({_STEAM_RANKINGS_SQL})"
+            self.create_steam_rankings()
+        return "steam_rankings"
 
     def create_hourly_kpis(self) -> None:
         """Create or update hourly KPIs table from Steam KPIs data.
@@ -689,27 +760,19 @@ class KPIAggregator:
     def export_steam_rankings(self, output_path: Path) -> None:
         """Export Steam game rankings based on average peak CCU.
 
+        Reads the steam_rankings table materialized by create_steam_rankings().
+
         Args:
             output_path: Path to output JSON file
         """
-        sql = """
-            SELECT
-                game_name,
-                steam_app_id,
-                igdb_id,
-                AVG(peak_ccu) as avg_peak_ccu,
-                MAX(peak_ccu) as all_time_peak_ccu,
-                AVG(avg_ccu) as avg_ccu,
-                AVG(avg_metacritic_score) as avg_metacritic_score,
-                MAX(avg_metacritic_score) as latest_metacritic_score,
-                AVG(avg_price_cents) as avg_price_cents,
-                COUNT(DISTINCT date) as days_tracked
-            FROM steam_daily_kpis
-            GROUP BY game_name, steam_app_id, igdb_id
+        if not self.db_manager:
+            return
+
+        sql = f"""
+            SELECT * FROM {self._steam_rankings_source()}
             ORDER BY avg_peak_ccu DESC
         """
-        if self.db_manager:
-            self.db_manager.export_to_json(query=sql, output_path=output_path)
+        self.db_manager.export_to_json(query=sql, output_path=output_path)
 
     def export_twitch_rankings(self, output_path: Path) -> None:
         """Export Twitch game rankings based on average peak viewers.
@@ -740,7 +803,10 @@ class KPIAggregator:
         Args:
             output_path: Path to output JSON file
         """
-        sql = """
+        if not self.db_manager:
+            return
+
+        sql = f"""
             SELECT
                 COALESCE(s.game_name, t.game_name) as game_name,
                 COALESCE(s.igdb_id, t.igdb_id) as igdb_id,
@@ -755,16 +821,7 @@ class KPIAggregator:
                 t.avg_viewers,
                 t.avg_channels,
                 t.days_tracked as twitch_days_tracked
-            FROM (
-                SELECT
-                    game_name, steam_app_id, igdb_id,
-                    AVG(peak_ccu) as avg_peak_ccu,
-                    MAX(peak_ccu) as all_time_peak_ccu,
-                    AVG(avg_ccu) as avg_ccu,
-                    COUNT(DISTINCT date) as days_tracked
-                FROM steam_daily_kpis
-                GROUP BY game_name, steam_app_id, igdb_id
-            ) s
+            FROM {self._steam_rankings_source()} s
             FULL OUTER JOIN (
                 SELECT
                     game_name, twitch_game_id, igdb_id,
@@ -778,8 +835,7 @@ class KPIAggregator:
             ) t ON s.igdb_id = t.igdb_id
             ORDER BY COALESCE(s.avg_peak_ccu, 0) + COALESCE(t.avg_peak_viewers, 0) DESC
         """
-        if self.db_manager:
-            self.db_manager.export_to_json(query=sql, output_path=output_path)
+        self.db_manager.export_to_json(query=sql, output_path=output_path)
 
     def export_steam_weekly_kpis(self, output_path: Path, weeks: int = 12) -> None:
         """Export Steam weekly KPIs to JSON.
@@ -929,10 +985,10 @@ class KPIAggregator:
                     except (json.JSONDecodeError, TypeError):
                         pass  # Keep as-is if not valid JSON
 
-        # Write to file
+        # Write compact JSON (machine-consumed; served gzip-compressed)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, "w") as f:
-            json.dump(games, f, indent=2)
+            json.dump(games, f, separators=(",", ":"))
 
     def cleanup_old_raw_data(self, retention_days: int = 7) -> int:
         """Delete raw Steam KPIs data older than retention period.
@@ -1093,6 +1149,16 @@ class KPIAggregator:
         if files_deleted > 0:
             print(f"🧹 Deleted {files_deleted:,} old Parquet files (>7 days)")
 
+        self.export_all(output_dir)
+
+    def export_all(self, output_dir: Path) -> None:
+        """Export all dashboard JSON files from the aggregated tables.
+
+        Args:
+            output_dir: Directory to write JSON exports
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+
         # Export metadata
         self.export_game_metadata(output_path=output_dir / "game-metadata.json")
 
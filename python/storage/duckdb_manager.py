@@ -5,6 +5,75 @@ from typing import Any
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+
+from python.storage.export_cache import ExportCache
+
+# ISO 8601 with milliseconds, e.g. 2025-10-22T14:00:00.000
+JSON_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%g"
+
+# Nullable pandas dtypes for integer and boolean columns with NULLs, as .df() returns them
+_NULLABLE_TYPES = {
+    pa.bool_(): pd.BooleanDtype(),
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(),
+}
+
+
+def _df_field(field: pa.Field) -> pa.Field:
+    """Return the Arrow field type that converts to the pandas dtype .df() would use."""
+    if pa.types.is_decimal(field.type):
+        return field.with_type(pa.float64())
+    if pa.types.is_date(field.type):
+        return field.with_type(pa.timestamp("us"))
+    return field
+
+
+# Parameterized upsert with ON CONFLICT (more reliable than INSERT OR REPLACE for complex tables)
+_UPSERT_GAME_METADATA_SQL = """
+    INSERT INTO game_metadata (
+        igdb_id, game_name, slug,
+        steam_app_id, twitch_game_id, youtube_channel_id, epic_id, gog_id,
+        igdb_summary, first_release_date, cover_url,
+        steam_description, steam_required_age,
+        genres, themes, platforms, game_modes, developers, publishers, websites,
+        discovery_source, discovery_date, last_updated, is_active,
+        track_steam, track_twitch, track_reddit
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (igdb_id) DO UPDATE SET
+        game_name = EXCLUDED.game_name,
+        slug = EXCLUDED.slug,
+        steam_app_id = EXCLUDED.steam_app_id,
+        twitch_game_id = EXCLUDED.twitch_game_id,
+        youtube_channel_id = EXCLUDED.youtube_channel_id,
+        epic_id = EXCLUDED.epic_id,
+        gog_id = EXCLUDED.gog_id,
+        igdb_summary = EXCLUDED.igdb_summary,
+        first_release_date = EXCLUDED.first_release_date,
+        cover_url = EXCLUDED.cover_url,
+        steam_description = EXCLUDED.steam_description,
+        steam_required_age = EXCLUDED.steam_required_age,
+        genres = EXCLUDED.genres,
+        themes = EXCLUDED.themes,
+        platforms = EXCLUDED.platforms,
+        game_modes = EXCLUDED.game_modes,
+        developers = EXCLUDED.developers,
+        publishers = EXCLUDED.publishers,
+        websites = EXCLUDED.websites,
+        discovery_source = EXCLUDED.discovery_source,
+        discovery_date = EXCLUDED.discovery_date,
+        last_updated = EXCLUDED.last_updated,
+        is_active = EXCLUDED.is_active,
+        track_steam = EXCLUDED.track_steam,
+        track_twitch = EXCLUDED.track_twitch,
+        track_reddit = EXCLUDED.track_reddit
+"""
 
 
 class DuckDBManager:
@@ -17,58 +86,116 @@ class DuckDBManager:
     - Context manager support for automatic connection handling
     """
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        export_cache: ExportCache | None = None,
+        read_only: bool = False,
+        config: dict[str, Any] | None = None,
+    ) -> None:
         """Initialize DuckDB connection.
 
         Args:
             db_path: Path to the DuckDB database file.
-                     Will be created if it doesn't exist.
+                     Will be created if it doesn't exist (unless read_only).
+            export_cache: Optional cache reused by export_to_json() while the
+                          database is unchanged
+            read_only: Open the database read-only, so several readers (e.g.
+                       export scripts) can use it concurrently
+            config: Optional DuckDB settings, e.g. {"threads": 2, "memory_limit": "512MB"}
         """
         self.db_path = db_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = duckdb.connect(str(self.db_path))
+        self.export_cache = export_cache
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = duckdb.connect(str(self.db_path), read_only=read_only, config=config or {})
 
-    def append_data(self, df: pd.DataFrame, table_name: str) -> None:
-        """Append DataFrame to a table in DuckDB.
+    def append_data(self, df: pd.DataFrame | pa.Table, table_name: str) -> None:
+        """Append DataFrame (or Arrow table) to a table in DuckDB.
 
         Creates table if it doesn't exist. If table exists, appends data.
 
         Args:
-            df: DataFrame to append
+            df: DataFrame or pyarrow Table to append
             table_name: Name of the table in DuckDB
 
         Example:
             >>> df = pd.DataFrame({'game': ['CS2'], 'players': [1000000]})
             >>> manager.append_data(df, 'steam_data')
         """
-        # Register DataFrame as a temporary view
+        # Register the DataFrame as a temporary view over an Arrow table, so DuckDB
+        # scans columnar buffers instead of converting pandas columns itself
+        if isinstance(df, pd.DataFrame):
+            df = pa.Table.from_pandas(df, preserve_index=False)
         self.conn.register("temp_df", df)
 
-        # Check if table exists
-        result = self.conn.execute(
-            f"""
-            SELECT COUNT(*)
-            FROM information_schema.tables
-            WHERE table_name = '{table_name}'
-        """
-        ).fetchone()
-        table_exists = result[0] if result else 0
-
-        if table_exists:
-            # Append to existing table
-            self.conn.execute(f"INSERT INTO {table_name} SELECT * FROM temp_df")
-        else:
-            # Create new table from DataFrame
-            self.conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM temp_df")
+        # Create the table from the DataFrame schema if needed, without an
+        # information_schema lookup per call
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM temp_df LIMIT 0"
+        )
+        self.conn.execute(f"INSERT INTO {table_name} SELECT * FROM temp_df")
 
         # Unregister temp view
         self.conn.unregister("temp_df")
 
-    def query(self, sql: str) -> pd.DataFrame:
+    def append_parquet(self, path: Path | str, table_name: str) -> None:
+        """Append Parquet file(s) to a table in DuckDB.
+
+        Scans the files with DuckDB's native Parquet reader instead of
+        round-tripping them through pandas. Creates the table from the
+        Parquet schema if it doesn't exist.
+
+        Args:
+            path: Parquet file path or glob pattern (e.g. 'data/**/*.parquet')
+            table_name: Name of the table in DuckDB
+
+        Example:
+            >>> manager.append_parquet(Path('data/raw/steam/cs2.parquet'), 'steam_raw')
+        """
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM read_parquet(?) LIMIT 0",
+            [str(path)],
+        )
+
+        # Raw rows carry their own timestamps, so let DuckDB insert them in parallel
+        # without preserving file order; exports rely on ordering, so restore it after
+        self.conn.execute("SET preserve_insertion_order = false")
+        try:
+            self.conn.execute(
+                f"INSERT INTO {table_name} SELECT * FROM read_parquet(?)", [str(path)]
+            )
+        finally:
+            self.conn.execute("RESET preserve_insertion_order")
+
+    def create_parquet_view(self, view_name: str, path: Path | str) -> None:
+        """Create (or replace) a view over partitioned Parquet files.
+
+        Queries against the view scan the files in place, with hive partition
+        columns (e.g. date=, game_id=) available for filter pushdown.
+
+        Args:
+            view_name: Name of the view in DuckDB
+            path: Parquet file path or glob pattern (e.g. 'data/**/*.parquet')
+
+        Example:
+            >>> manager.create_parquet_view('steam_raw', 'data/raw/steam/**/*.parquet')
+        """
+        # Views can't hold prepared parameters, so quote the path as a literal
+        pattern = str(path).replace("'", "''")
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE VIEW {view_name} AS
+            SELECT * FROM read_parquet('{pattern}', hive_partitioning=1)
+        """
+        )
+
+    def query(self, sql: str, params: list[Any] | None = None) -> pd.DataFrame:
         """Execute SQL query and return results as DataFrame.
 
         Args:
-            sql: SQL query string
+            sql: SQL query string, optionally with ? placeholders
+            params: Values bound to the placeholders
 
         Returns:
             Query results as pandas DataFrame
@@ -76,9 +203,60 @@ class DuckDBManager:
         Example:
             >>> result = manager.query("SELECT * FROM steam_data WHERE player_count > 1000000")
         """
-        result: pd.DataFrame = self.conn.execute(sql).df()
+        # Fetch as Arrow and convert in one pass, with the same dtypes as .df():
+        # DECIMAL results (e.g. SUM of integers) as float64 and DATE as datetime64[us]
+        table = self.to_arrow(sql, params)
+        schema = pa.schema(map(_df_field, table.schema))
+        if schema != table.schema:
+            table = table.cast(schema)
+        result: pd.DataFrame = table.to_pandas()
+
+        # Integer and boolean columns with NULLs keep their type (e.g. steam_app_id)
+        # instead of becoming float64 / object
+        for i, column in enumerate(table.columns):
+            if column.null_count and column.type in _NULLABLE_TYPES:
+                result.isetitem(i, column.to_pandas(types_mapper=_NULLABLE_TYPES.get))
         return result
 
+    def to_arrow(self, sql: str, params: list[Any] | None = None) -> pa.Table:
+        """Execute SQL query and return results as a pyarrow Table.
+
+        Numeric and timestamp columns are handed over without a pandas conversion,
+        e.g. for consumers that work on Arrow data directly.
+
+        Args:
+            sql: SQL query string, optionally with ? placeholders
+            params: Values bound to the placeholders
+
+        Returns:
+            Query results as pyarrow Table
+
+        Example:
+            >>> table = manager.to_arrow("SELECT game_name, player_count FROM steam_data")
+        """
+        # Older DuckDB returns a Table, newer a RecordBatchReader
+        arrow = self.conn.execute(sql, params or []).arrow()
+        return arrow.read_all() if isinstance(arrow, pa.RecordBatchReader) else arrow
+
+    def scalar(self, sql: str, params: list[Any] | None = None) -> Any:
+        """Execute SQL query and return the first column of the first row.
+
+        Skips building a DataFrame for single-value lookups such as counts.
+
+        Args:
+            sql: SQL query string, optionally with ? placeholders
+            params: Values bound to the placeholders
+
+        Returns:
+            The value, or None if the query returned no rows
+
+        Example:
+            >>> manager.scalar("SELECT COUNT(*) FROM steam_data")
+            42
+        """
+        row = self.conn.execute(sql, params or []).fetchone()
+        return row[0] if row else None
+
     def export_to_json(
         self,
         output_path: Path,
@@ -112,15 +290,52 @@ class DuckDBManager:
             assert query is not None
             sql = query
 
-        # Get data as DataFrame and export to JSON
-        df = self.query(sql)
+        cache_key = None
+        if self.export_cache is not None:
+            cache_key = self.export_cache.key(sql, self.db_path)
+            if self.export_cache.fetch(cache_key, output_path):
+                return
+
+        # Let DuckDB write the JSON array directly instead of going through pandas
+        target = str(output_path).replace("'", "''")
+        self.conn.execute(
+            f"COPY (SELECT {self._json_columns(sql)} FROM ({sql})) "
+            f"TO '{target}' (FORMAT JSON, ARRAY true)"
+        )
 
-        # Replace NaN/inf with None to ensure valid JSON (NaN is not valid JSON)
-        import numpy as np
+        if self.export_cache is not None and cache_key is not None:
+            self.export_cache.store(cache_key, output_path)
 
-        df = df.replace([np.nan, np.inf, -np.inf], None)
+    def _json_columns(self, sql: str) -> str:
+        """Build a select list that makes query results safe to write as JSON.
 
-        df.to_json(output_path, orient="records", date_format="iso", indent=2)
+        NaN and infinity are not valid JSON, so non-finite floats are exported
+        as null. Dates and timestamps are formatted as ISO 8601 strings, which
+        the dashboard parses.
+
+        Args:
+            sql: SQL query whose columns will be exported
+
+        Returns:
+            Comma-separated column expressions, or "*" if no column needs converting
+        """
+        relation = self.conn.sql(sql)
+        columns = []
+        rewritten = False
+        for name, dtype in zip(relation.columns, relation.types, strict=True):
+            column = '"' + name.replace('"', '""') + '"'
+            type_name = str(dtype)
+            if type_name in ("DOUBLE", "FLOAT"):
+                columns.append(f"CASE WHEN isfinite({column}) THEN {column} END AS {column}")
+                rewritten = True
+            elif type_name == "DATE" or type_name.startswith("TIMESTAMP"):
+                columns.append(f"strftime({column}, '{JSON_TIMESTAMP_FORMAT}') AS {column}")
+                rewritten = True
+            else:
+                columns.append(column)
+
+        # Nothing to convert: let COPY stream the query's own columns
+        return ", ".join(columns) if rewritten else "*"
 
     def create_game_list_table(self) -> None:
         """Create game_list table for discovered games.
@@ -247,6 +462,31 @@ class DuckDBManager:
             >>> metadata = igdb_collector.enrich_game(2963)
             >>> manager.upsert_game_metadata(metadata)
         """
+        self.conn.execute(_UPSERT_GAME_METADATA_SQL, self._game_metadata_values(metadata))
+
+    def upsert_game_metadata_many(self, metadata_list: list[dict[str, Any]]) -> None:
+        """Insert or update several games' metadata with one prepared statement.
+
+        The upsert is parsed and planned once and every row is bound to it, instead
+        of preparing the statement again per game as repeated upsert_game_metadata()
+        calls do.
+
+        Args:
+            metadata_list: Metadata dictionaries as accepted by upsert_game_metadata()
+
+        Example:
+            >>> manager.upsert_game_metadata_many([cs2_metadata, dota2_metadata])
+        """
+        if not metadata_list:
+            return
+        self.conn.executemany(
+            _UPSERT_GAME_METADATA_SQL,
+            [self._game_metadata_values(metadata) for metadata in metadata_list],
+        )
+
+    @staticmethod
+    def _game_metadata_values(metadata: dict[str, Any]) -> list[Any]:
+        """Build the upsert parameters for one game, JSON-encoding list columns."""
         import json
 
         # Prepare JSON fields
@@ -258,8 +498,7 @@ class DuckDBManager:
         publishers_json = json.dumps(metadata.get("publishers", []))
         websites_json = json.dumps(metadata.get("websites", {}))
 
-        # Build values list
-        values = [
+        return [
             metadata["igdb_id"],
             metadata["game_name"],
             metadata.get("slug"),
@@ -289,49 +528,6 @@ class DuckDBManager:
             metadata.get("track_reddit", False),
         ]
 
-        # Use parameterized query with ON CONFLICT (more reliable than INSERT OR REPLACE for complex tables)
-        self.conn.execute(
-            """
-            INSERT INTO game_metadata (
-                igdb_id, game_name, slug,
-                steam_app_id, twitch_game_id, youtube_channel_id, epic_id, gog_id,
-                igdb_summary, first_release_date, cover_url,
-                steam_description, steam_required_age,
-                genres, themes, platforms, game_modes, developers, publishers, websites,
-                discovery_source, discovery_date, last_updated, is_active,
-                track_steam, track_twitch, track_reddit
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT (igdb_id) DO UPDATE SET
-                game_name = EXCLUDED.game_name,
-                slug = EXCLUDED.slug,
-                steam_app_id = EXCLUDED.steam_app_id,
-                twitch_game_id = EXCLUDED.twitch_game_id,
-                youtube_channel_id = EXCLUDED.youtube_channel_id,
-                epic_id = EXCLUDED.epic_id,
-                gog_id = EXCLUDED.gog_id,
-                igdb_summary = EXCLUDED.igdb_summary,
-                first_release_date = EXCLUDED.first_release_date,
-                cover_url = EXCLUDED.cover_url,
-                steam_description = EXCLUDED.steam_description,
-                steam_required_age = EXCLUDED.steam_required_age,
-                genres = EXCLUDED.genres,
-                themes = EXCLUDED.themes,
-                platforms = EXCLUDED.platforms,
-                game_modes = EXCLUDED.game_modes,
-                developers = EXCLUDED.developers,
-                publishers = EXCLUDED.publishers,
-                websites = EXCLUDED.websites,
-                discovery_source = EXCLUDED.discovery_source,
-                discovery_date = EXCLUDED.discovery_date,
-                last_updated = EXCLUDED.last_updated,
-                is_active = EXCLUDED.is_active,
-                track_steam = EXCLUDED.track_steam,
-                track_twitch = EXCLUDED.track_twitch,
-                track_reddit = EXCLUDED.track_reddit
-        """,
-            values,
-        )
-
     def get_game_metadata(
         self, igdb_id: int | None = None, steam_app_id: int | None = None
     ) -> dict[str, Any] | None:
@@ -350,10 +546,13 @@ class DuckDBManager:
             >>> print(metadata['game_name'])
             'Dota 2'
         """
+        # Fixed statements with bound ids, so DuckDB never parses id values as SQL text
         if igdb_id is not None:
-            result = self.query(f"SELECT * FROM game_metadata WHERE igdb_id = {igdb_id}")
+            result = self.query("SELECT * FROM game_metadata WHERE igdb_id = ?", [igdb_id])
         elif steam_app_id is not None:
-            result = self.query(f"SELECT * FROM game_metadata WHERE steam_app_id = {steam_app_id}")
+            result = self.query(
+                "SELECT * FROM game_metadata WHERE steam_app_id = ?", [steam_app_id]
+            )
         else:
             raise ValueError("Must provide either igdb_id or steam_app_id")
 
@@ -549,6 +748,14 @@ class DuckDBManager:
             [igdb_id],
         )
 
+    def checkpoint(self) -> None:
+        """Write the write-ahead log into the database file.
+
+        Makes committed data durable in the file itself without closing the
+        connection, e.g. before another process opens the database read-only.
+        """
+        self.conn.execute("CHECKPOINT")
+
     def close(self) -> None:
         """Close the DuckDB connection."""
         if self.conn:
@@ -0,0 +1,107 @@
+"""On-disk cache for JSON exports produced from DuckDB queries."""
+
+import hashlib
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+# Queries whose result depends on the wall clock (e.g. "CURRENT_DATE - INTERVAL '7' DAY");
+# DuckDB evaluates these in the local time zone, like datetime.now()
+_CURRENT_DATE = re.compile(r"\b(current_date|today\s*\()", re.IGNORECASE)
+_CURRENT_TIME = re.compile(
+    r"\b(current_timestamp|current_time|localtimestamp|get_current_timestamp|now\s*\()",
+    re.IGNORECASE,
+)
+
+
+class ExportCache:
+    """Content-addressed cache of exported JSON files.
+
+    Entries are keyed by the SQL text and a watermark of the database files,
+    so a re-export against an unchanged database is served by a file copy
+    instead of a DuckDB query. Least recently used entries are evicted once
+    the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """Initialize the export cache.
+
+        Args:
+            cache_dir: Directory holding cached JSON files
+            max_bytes: Maximum total size of cached files (default: 64 MB)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, sql: str, db_path: Path, now: datetime | None = None) -> str:
+        """Compute the cache key for a query against a database.
+
+        The watermark is the size and modification time of the database file
+        and its write-ahead log, which change whenever data is committed.
+        Queries using CURRENT_DATE also include today's date, and queries
+        using CURRENT_TIMESTAMP or now() the current hour, so relative time
+        windows are re-exported once they move on.
+
+        Args:
+            sql: SQL query being exported
+            db_path: Path to the DuckDB database file
+            now: Current local time (default: datetime.now())
+
+        Returns:
+            Hex digest identifying the export
+        """
+        digest = hashlib.sha256(sql.encode())
+        if _CURRENT_TIME.search(sql):
+            now = now or datetime.now()
+            digest.update(f"time:{now:%Y-%m-%dT%H}".encode())
+        elif _CURRENT_DATE.search(sql):
+            now = now or datetime.now()
+            digest.update(f"date:{now:%Y-%m-%d}".encode())
+        for path in (db_path, db_path.with_name(db_path.name + ".wal")):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    def fetch(self, key: str, output_path: Path) -> bool:
+        """Copy a cached export to output_path if present.
+
+        Args:
+            key: Cache key from key()
+            output_path: Destination JSON file
+
+        Returns:
+            True if the export was served from cache, False otherwise
+        """
+        cached = self.cache_dir / f"{key}.json"
+        if not cached.exists():
+            return False
+
+        shutil.copyfile(cached, output_path)
+        cached.touch()  # Mark as recently used
+        return True
+
+    def store(self, key: str, output_path: Path) -> None:
+        """Add a freshly written export to the cache.
+
+        Args:
+            key: Cache key from key()
+            output_path: JSON file that was just exported
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output_path, self.cache_dir / f"{key}.json")
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = [(path, path.stat()) for path in self.cache_dir.glob("*.json")]
+        total = sum(stat.st_size for _, stat in entries)
+
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
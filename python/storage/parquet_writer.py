@@ -18,7 +18,9 @@ class ParquetWriter:
         """
         self.base_path = Path(base_path)
 
-    def save(self, data: list[dict[str, Any]], partition_cols: list[str] | None = None) -> None:
+    def save(
+        self, data: list[dict[str, Any]], partition_cols: list[str] | None = None
+    ) -> list[Path]:
         """
         Save data to Parquet files with optional partitioning.
 
@@ -26,6 +28,9 @@ class ParquetWriter:
             data: List of dictionaries containing game data
             partition_cols: Columns to partition by (e.g., ["date", "game_id"])
 
+        Returns:
+            Paths of the Parquet files written
+
         Raises:
             ValueError: If data is empty or invalid
             TypeError: If data types are incorrect
@@ -47,7 +52,7 @@ class ParquetWriter:
 
         if partition_cols:
             # Save with partitioning
-            self._save_partitioned(df, partition_cols)
+            return self._save_partitioned(df, partition_cols)
         else:
             # Save single file with game_id and timestamp
             game_id = int(df["game_id"].iloc[0])
@@ -56,6 +61,7 @@ class ParquetWriter:
             filename = f"{game_id}_{timestamp_str}.parquet"
             filepath = self.base_path / filename
             df.to_parquet(filepath, index=False)
+            return [filepath]
 
     def _add_partition_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -101,14 +107,19 @@ class ParquetWriter:
         if not pd.api.types.is_integer_dtype(df["player_count"]):
             raise TypeError("player_count must be integer type")
 
-    def _save_partitioned(self, df: pd.DataFrame, partition_cols: list[str]) -> None:
+    def _save_partitioned(self, df: pd.DataFrame, partition_cols: list[str]) -> list[Path]:
         """
         Save DataFrame with partitioning.
 
         Args:
             df: DataFrame to save
             partition_cols: Columns to partition by
+
+        Returns:
+            Paths of the Parquet files written, one per partition
         """
+        written = []
+
         # Group by partition columns
         for keys, group in df.groupby(partition_cols):
             # Build partition path
@@ -131,3 +142,6 @@ class ParquetWriter:
 
             # Save partition
             group.to_parquet(filepath, index=False)
+            written.append(filepath)
+
+        return written
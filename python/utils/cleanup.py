@@ -1,6 +1,10 @@
 """Cleanup utility for data retention policy - removes old Parquet files."""
 
+import os
 import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import TypedDict
 
@@ -12,6 +16,102 @@ class CleanupResult(TypedDict):
     bytes_freed: int
 
 
+# Hive-style partition directory written by ParquetWriter (date=YYYY-MM-DD);
+# ISO dates sort lexicographically in date order, so names compare as strings
+_DATE_PREFIX = "date="
+
+# Directory scans and unlinks release the GIL, so threads overlap their I/O
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Unlinking relative to an open directory skips re-resolving the full path (POSIX only)
+_UNLINK_DIR_FD = os.unlink in os.supports_dir_fd
+
+
+def _scan(
+    path: str, cutoff_ns: int, cutoff_partition: str, subdirs: list[str]
+) -> Iterator[tuple[str, str, int]]:
+    """Yield (directory, name, size) for expired Parquet files directly inside ``path``.
+
+    Subdirectories to descend into are appended to ``subdirs``. Partition directories
+    named after ``cutoff_partition`` (e.g. date=2025-09-22) only hold files written
+    after the cutoff, so they are left out.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                name = entry.name
+                if (
+                    len(name) == len(cutoff_partition)
+                    and name.startswith(_DATE_PREFIX)
+                    and name > cutoff_partition
+                ):
+                    continue
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".parquet") and not entry.is_symlink():
+                # lstat info is cached on the DirEntry, so this costs no path lookup
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime_ns < cutoff_ns:
+                    yield path, entry.name, stat.st_size
+
+
+def _iter_candidates(
+    path: str, cutoff_ns: int, cutoff_partition: str
+) -> Iterator[tuple[str, str, int]]:
+    """Recursively yield (directory, name, size) for expired Parquet files below ``path``."""
+    subdirs: list[str] = []
+    yield from _scan(path, cutoff_ns, cutoff_partition, subdirs)
+    for subdir in subdirs:
+        yield from _iter_candidates(subdir, cutoff_ns, cutoff_partition)
+
+
+def _expire_files(
+    candidates: Iterable[tuple[str, str, int]], dry_run: bool
+) -> tuple[int, int, set[str]]:
+    """Delete expired files as they are streamed in.
+
+    Files are unlinked relative to an open fd of their directory, which is reused
+    while consecutive files share it.
+
+    Args:
+        candidates: (directory, name, size) tuples as yielded by _iter_candidates
+        dry_run: If True, only count the files that would be deleted
+
+    Returns:
+        Tuple of (files_deleted, bytes_freed, parent directories of deleted files)
+    """
+    files_deleted = 0
+    bytes_freed = 0
+    parents: set[str] = set()
+    fd: int | None = None
+    fd_directory = None
+
+    try:
+        for directory, name, size in candidates:
+            # Track file size before deletion
+            bytes_freed += size
+            files_deleted += 1
+            parents.add(directory)
+
+            if dry_run:
+                continue
+
+            if not _UNLINK_DIR_FD:
+                os.unlink(os.path.join(directory, name))
+                continue
+
+            if directory != fd_directory:
+                if fd is not None:
+                    os.close(fd)
+                fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                fd_directory = directory
+            os.unlink(name, dir_fd=fd)
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+    return files_deleted, bytes_freed, parents
+
+
 def cleanup_old_data(
     base_path: Path,
     days_to_keep: int = 30,
@@ -40,40 +140,50 @@ def cleanup_old_data(
         raise FileNotFoundError(f"Directory not found: {base_path}")
 
     cutoff_time = time.time() - (days_to_keep * 24 * 60 * 60)
+    cutoff_ns = int(cutoff_time * 1_000_000_000)
+    cutoff_date = datetime.fromtimestamp(cutoff_time, tz=UTC).date()
+    cutoff_partition = f"{_DATE_PREFIX}{cutoff_date.isoformat()}"
+
+    # Expire top-level files here and walk each subdirectory tree in its own thread
+    subdirs: list[str] = []
+    results = [_expire_files(_scan(str(base_path), cutoff_ns, cutoff_partition, subdirs), dry_run)]
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(subdirs))) as executor:
+            results.extend(
+                executor.map(
+                    lambda subdir: _expire_files(
+                        _iter_candidates(subdir, cutoff_ns, cutoff_partition), dry_run
+                    ),
+                    subdirs,
+                )
+            )
 
     files_deleted = 0
     bytes_freed = 0
-    empty_dirs: set[Path] = set()
-
-    # Find all Parquet files older than retention period
-    for parquet_file in base_path.rglob("*.parquet"):
-        if parquet_file.stat().st_mtime < cutoff_time:
-            # Track file size before deletion
-            file_size = parquet_file.stat().st_size
-            bytes_freed += file_size
-
-            if not dry_run:
-                parquet_file.unlink()
-
-            files_deleted += 1
-
-            # Track potentially empty parent directories
-            if remove_empty_dirs:
-                empty_dirs.add(parquet_file.parent)
+    empty_dirs: set[str] = set()
+    for deleted, freed, parents in results:
+        files_deleted += deleted
+        bytes_freed += freed
+        # Track potentially empty parent directories
+        if remove_empty_dirs:
+            empty_dirs.update(parents)
 
     # Remove empty directories if requested
     if remove_empty_dirs and not dry_run:
-        # Sort directories by depth (deepest first) to remove leaf dirs first
-        sorted_dirs = sorted(empty_dirs, key=lambda p: len(p.parts), reverse=True)
-
-        for directory in sorted_dirs:
-            if directory.exists() and not any(directory.iterdir()):
-                directory.rmdir()
-
-                # Check if parent is now empty
-                parent = directory.parent
-                while parent != base_path and not any(parent.iterdir()):
-                    parent.rmdir()
-                    parent = parent.parent
+        # Candidates are the emptied directories plus their ancestors below base_path
+        base = str(base_path)
+        candidates: set[str] = set()
+        for directory in empty_dirs:
+            while directory != base and directory not in candidates:
+                candidates.add(directory)
+                directory = os.path.dirname(directory)
+
+        # Post-order (deepest first), so game_id= dirs go before their date= dir;
+        # rmdir refuses non-empty directories, so no listing is needed
+        for directory in sorted(candidates, key=lambda d: d.count(os.sep), reverse=True):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
 
     return CleanupResult(files_deleted=files_deleted, bytes_freed=bytes_freed)
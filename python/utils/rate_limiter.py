@@ -0,0 +1,47 @@
+"""Token bucket rate limiter for API clients shared across threads."""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Allows bursts of up to ``capacity`` calls, refilled evenly over ``period`` seconds.
+
+    Example:
+        >>> limiter = TokenBucket(capacity=200, period=300)  # 200 requests / 5 min
+        >>> limiter.acquire()  # returns immediately while tokens are left
+        0.0
+    """
+
+    def __init__(self, capacity: int, period: float) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of calls per period
+            period: Length of the period in seconds
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available.
+
+        The token is reserved under the lock and the wait happens outside it, so
+        concurrent callers queue up one refill interval apart.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate) - 1
+            self._updated = now
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
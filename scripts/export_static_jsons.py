@@ -23,24 +23,19 @@ def main() -> None:
     print("📤 Exporting JSON files from DuckDB...")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    with KPIAggregator(db_path=db_path) as aggregator:
+    # Re-exports against an unchanged database are served from the cache.
+    # Exports are small selects, so a couple of threads and a modest memory cap suffice.
+    cache_dir = project_root / "data" / "cache" / "exports"
+    with KPIAggregator(
+        db_path=db_path,
+        export_cache_dir=cache_dir,
+        read_only=True,
+        db_config={"threads": 2, "memory_limit": "512MB"},
+    ) as aggregator:
         # Export all JSON files (without re-aggregating)
-        aggregator.export_game_metadata(output_path=output_dir / "game-metadata.json")
-        aggregator.export_game_rankings(output_path=output_dir / "game_rankings.json")
-        aggregator.export_all_daily_kpis(output_path=output_dir / "daily_kpis.json")
-        aggregator.export_latest_kpis(
-            output_path=output_dir / "latest_kpis.json", days=30
-        )  # 30 days for chart
-        aggregator.export_weekly_kpis(output_path=output_dir / "weekly_kpis.json")
-        aggregator.export_monthly_kpis(output_path=output_dir / "monthly_kpis.json")
+        aggregator.export_all(output_dir)
 
     print(f"✅ All JSON files exported to {output_dir}/")
-    print("  • game-metadata.json")
-    print("  • game_rankings.json")
-    print("  • daily_kpis.json")
-    print("  • latest_kpis.json (last 30 days)")
-    print("  • weekly_kpis.json")
-    print("  • monthly_kpis.json")
 
 
 if __name__ == "__main__":
@@ -4,6 +4,16 @@ from python.processors.aggregator import KPIAggregator
 
 db_path = Path('data/duckdb/gaming.db')
 
+
+def print_counts(aggregator, tables):
+    """Print row counts for several tables using a single UNION ALL query."""
+    sql = " UNION ALL ".join(
+        f"SELECT '{table}' AS table_name, COUNT(*) AS count FROM {table}" for table in tables
+    )
+    for _, row in aggregator.db_manager.query(sql).iterrows():
+        print(f"✅ {row['table_name']}: {row['count']} records")
+
+
 print("🚀 TESTING COMPLETE AGGREGATION PIPELINE\n")
 print("=" * 60)
 
@@ -14,13 +24,7 @@ with KPIAggregator(db_path=db_path) as aggregator:
     aggregator.create_daily_kpis()
     
     # Check daily results
-    steam_daily = aggregator.db_manager.query("SELECT COUNT(*) as count FROM steam_daily_kpis")
-    twitch_daily = aggregator.db_manager.query("SELECT COUNT(*) as count FROM twitch_daily_kpis")
-    igdb_daily = aggregator.db_manager.query("SELECT COUNT(*) as count FROM igdb_ratings_snapshot")
-    
-    print(f"✅ steam_daily_kpis: {steam_daily['count'][0]} records")
-    print(f"✅ twitch_daily_kpis: {twitch_daily['count'][0]} records")
-    print(f"✅ igdb_ratings_snapshot: {igdb_daily['count'][0]} records")
+    print_counts(aggregator, ["steam_daily_kpis", "twitch_daily_kpis", "igdb_ratings_snapshot"])
     
     # Test weekly aggregations
     print("\n📊 [2/3] Testing WEEKLY aggregations...")
@@ -28,13 +32,7 @@ with KPIAggregator(db_path=db_path) as aggregator:
     aggregator.create_weekly_kpis()
     
     # Check weekly results
-    steam_weekly = aggregator.db_manager.query("SELECT COUNT(*) as count FROM steam_weekly_kpis")
-    twitch_weekly = aggregator.db_manager.query("SELECT COUNT(*) as count FROM twitch_weekly_kpis")
-    igdb_weekly = aggregator.db_manager.query("SELECT COUNT(*) as count FROM igdb_ratings_weekly")
-    
-    print(f"✅ steam_weekly_kpis: {steam_weekly['count'][0]} records")
-    print(f"✅ twitch_weekly_kpis: {twitch_weekly['count'][0]} records")
-    print(f"✅ igdb_ratings_weekly: {igdb_weekly['count'][0]} records")
+    print_counts(aggregator, ["steam_weekly_kpis", "twitch_weekly_kpis", "igdb_ratings_weekly"])
     
     # Test monthly aggregations
     print("\n📊 [3/3] Testing MONTHLY aggregations...")
@@ -42,13 +40,7 @@ with KPIAggregator(db_path=db_path) as aggregator:
     aggregator.create_monthly_kpis()
     
     # Check monthly results
-    steam_monthly = aggregator.db_manager.query("SELECT COUNT(*) as count FROM steam_monthly_kpis")
-    twitch_monthly = aggregator.db_manager.query("SELECT COUNT(*) as count FROM twitch_monthly_kpis")
-    igdb_monthly = aggregator.db_manager.query("SELECT COUNT(*) as count FROM igdb_ratings_monthly")
-    
-    print(f"✅ steam_monthly_kpis: {steam_monthly['count'][0]} records")
-    print(f"✅ twitch_monthly_kpis: {twitch_monthly['count'][0]} records")
-    print(f"✅ igdb_ratings_monthly: {igdb_monthly['count'][0]} records")
+    print_counts(aggregator, ["steam_monthly_kpis", "twitch_monthly_kpis", "igdb_ratings_monthly"])
     
     # Display sample data
     print("\n" + "=" * 60)
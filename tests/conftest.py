@@ -0,0 +1,33 @@
+"""Shared pytest configuration for all tests."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# tmpfs mount on Linux; test databases and Parquet files never need to reach disk
+_SHM = Path("/dev/shm")
+
+# Base temp directory created by this run, removed again at exit
+_OWNED_BASETEMP = pytest.StashKey[str]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Put tmp_path directories on tmpfs unless --basetemp was given."""
+    # xdist workers inherit the controller's basetemp through their options
+    if config.option.basetemp is not None or hasattr(config, "workerinput"):
+        return
+    if not (_SHM.is_dir() and os.access(_SHM, os.W_OK)):
+        return
+
+    config.option.basetemp = tempfile.mkdtemp(prefix="pytest-", dir=_SHM)
+    config.stash[_OWNED_BASETEMP] = config.option.basetemp
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Free the tmpfs directory again; it is backed by memory."""
+    basetemp = config.stash.get(_OWNED_BASETEMP, None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
@@ -0,0 +1,30 @@
+"""Shared fixtures for integration tests."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from python.storage.duckdb_manager import DuckDBManager
+
+
+@pytest.fixture(scope="module")
+def shared_db(tmp_path_factory: pytest.TempPathFactory) -> Iterator[DuckDBManager]:
+    """Open a single DuckDB database for all tests in a module."""
+    db_path = tmp_path_factory.mktemp("duckdb") / "gaming.db"
+    with DuckDBManager(db_path=db_path) as db:
+        yield db
+
+
+@pytest.fixture
+def db(shared_db: DuckDBManager) -> Iterator[DuckDBManager]:
+    """Provide the shared database, dropping anything a test created."""
+    yield shared_db
+
+    for (view_name,) in shared_db.conn.execute(
+        "SELECT view_name FROM duckdb_views() WHERE NOT internal"
+    ).fetchall():
+        shared_db.conn.execute(f"DROP VIEW IF EXISTS {view_name}")
+    for (table_name,) in shared_db.conn.execute(
+        "SELECT table_name FROM duckdb_tables()"
+    ).fetchall():
+        shared_db.conn.execute(f"DROP TABLE IF EXISTS {table_name}")
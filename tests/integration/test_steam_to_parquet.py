@@ -1,6 +1,7 @@
 """Integration test: Steam collector to Parquet storage."""
 
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pandas as pd
@@ -9,6 +10,11 @@ from python.collectors.steam import SteamCollector
 from python.storage.parquet_writer import ParquetWriter
 
 
+def _to_parquet_record(game_data: dict[str, Any]) -> dict[str, Any]:
+    """Map a SteamCollector record to the raw Parquet schema (steam_app_id -> app_id)."""
+    return {("app_id" if key == "steam_app_id" else key): v for key, v in game_data.items()}
+
+
 def test_collect_and_save_cs2_data(tmp_path: Path) -> None:
     """Test end-to-end: collect CS2 data and save to Parquet."""
     # Setup
@@ -27,10 +33,9 @@ def test_collect_and_save_cs2_data(tmp_path: Path) -> None:
         game_data = collector.get_game_data(730)  # CS2
 
     # Save to Parquet with partitioning
-    writer.save([game_data], partition_cols=["date", "game_id"])
+    parquet_files = writer.save([_to_parquet_record(game_data)], partition_cols=["date", "game_id"])
 
     # Verify file structure
-    parquet_files = list(tmp_path.rglob("*.parquet"))
     assert len(parquet_files) == 1
 
     # Verify partitioned structure
@@ -78,14 +83,13 @@ def test_collect_multiple_games_and_save(tmp_path: Path) -> None:
         games_data = collector.collect_top_games(limit=3)
 
     # Save all games
-    writer.save(games_data, partition_cols=["date", "game_id"])
+    parquet_files = writer.save(games_data, partition_cols=["date", "game_id"])
 
     # Verify 3 partitions created
     game_partitions = list(tmp_path.rglob("game_id=*"))
     assert len(game_partitions) == 3
 
     # Verify each game has data
-    parquet_files = list(tmp_path.rglob("*.parquet"))
     assert len(parquet_files) == 3
 
     # Verify total records
@@ -0,0 +1,33 @@
+"""Shared fixtures for unit tests."""
+
+from unittest.mock import MagicMock
+
+import duckdb
+import pytest
+from click.testing import CliRunner
+
+from python.collectors.igdb import IGDBCollector
+from python.storage.duckdb_manager import DuckDBManager
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """CLI runner shared by all CLI tests; invoke() isolates each run's streams."""
+    return CliRunner()
+
+
+@pytest.fixture
+def duckdb_manager_mock() -> MagicMock:
+    """DuckDBManager stand-in limited to its real API, usable as a context manager."""
+    db = MagicMock(spec=DuckDBManager)
+    # Instance attribute set in __init__, so not part of the class spec
+    db.conn = MagicMock(spec=duckdb.DuckDBPyConnection)
+    db.__enter__.return_value = db
+    db.__exit__.return_value = False
+    return db
+
+
+@pytest.fixture
+def igdb_collector_mock() -> MagicMock:
+    """IGDBCollector stand-in limited to its real API."""
+    return MagicMock(spec=IGDBCollector)
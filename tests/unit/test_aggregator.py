@@ -1,51 +1,136 @@
 """Tests for KPI aggregation module."""
 
+import json
+import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
+import duckdb
+import numpy as np
 import pandas as pd
 import pytest
 
 from python.processors.aggregator import KPIAggregator
 
+# SQL fragments each generated statement must contain
+_STEAM_DAILY_CREATE_FRAGMENTS = tuple(
+    map(
+        sys.intern,
+        ("CREATE TABLE IF NOT EXISTS steam_daily_kpis", "PRIMARY KEY (date, steam_app_id)"),
+    )
+)
+_STEAM_DAILY_INSERT_FRAGMENTS = tuple(
+    map(
+        sys.intern,
+        (
+            "INSERT OR REPLACE INTO steam_daily_kpis",
+            "FROM steam_kpis s",
+            "LEFT JOIN game_metadata m ON s.steam_app_id = m.steam_app_id",
+        ),
+    )
+)
+_RANKINGS_TABLE_FRAGMENTS = tuple(
+    map(
+        sys.intern,
+        (
+            "CREATE OR REPLACE TABLE steam_rankings AS",
+            "AVG(peak_ccu) as avg_peak_ccu",
+            "FROM steam_daily_kpis",
+            "GROUP BY game_name, steam_app_id, igdb_id",
+        ),
+    )
+)
+_RANKINGS_EXPORT_FRAGMENTS = tuple(
+    map(sys.intern, ("FROM steam_rankings", "ORDER BY avg_peak_ccu DESC"))
+)
+_UNIFIED_FRAGMENTS = tuple(
+    map(
+        sys.intern,
+        (
+            "FROM steam_daily_kpis s",
+            "FULL OUTER JOIN twitch_daily_kpis t",
+            "FULL OUTER JOIN igdb_ratings_snapshot i",
+        ),
+    )
+)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def sample_steam_data():
     """Sample Steam raw data for testing."""
     return pd.DataFrame(
         {
-            "timestamp": [
-                "2025-10-22T10:00:00",
-                "2025-10-22T11:00:00",
-                "2025-10-22T12:00:00",
-                "2025-10-21T10:00:00",
-                "2025-10-21T11:00:00",
-            ],
-            "date": [
-                "2025-10-22",
-                "2025-10-22",
-                "2025-10-22",
-                "2025-10-21",
-                "2025-10-21",
-            ],
-            "game_name": [
-                "Counter-Strike 2",
-                "Counter-Strike 2",
-                "Counter-Strike 2",
-                "Counter-Strike 2",
-                "Counter-Strike 2",
-            ],
-            "app_id": [730, 730, 730, 730, 730],
-            "player_count": [1000000, 1100000, 1050000, 950000, 980000],
+            "timestamp": np.array(
+                [
+                    "2025-10-22T10:00:00",
+                    "2025-10-22T11:00:00",
+                    "2025-10-22T12:00:00",
+                    "2025-10-21T10:00:00",
+                    "2025-10-21T11:00:00",
+                ],
+                dtype="datetime64[s]",
+            ),
+            "date": np.array(
+                ["2025-10-22", "2025-10-22", "2025-10-22", "2025-10-21", "2025-10-21"],
+                dtype="datetime64[D]",
+            ),
+            "game_name": pd.Categorical(["Counter-Strike 2"] * 5),
+            "app_id": np.full(5, 730, dtype=np.int32),
+            "player_count": np.array(
+                [1_000_000, 1_100_000, 1_050_000, 950_000, 980_000], dtype=np.int64
+            ),
         }
     )
 
 
+@pytest.fixture(scope="module")
+def _mock_db_manager_singleton():
+    """Single DuckDB manager mock shared by the module."""
+    return MagicMock()
+
+
 @pytest.fixture
-def mock_db_manager():
-    """Mock DuckDB manager."""
-    mock = MagicMock()
-    return mock
+def mock_db_manager(_mock_db_manager_singleton):
+    """Mock DuckDB manager, reset before each test."""
+    _mock_db_manager_singleton.reset_mock(return_value=True, side_effect=True)
+    return _mock_db_manager_singleton
+
+
+def query_side_effect(sql):
+    """Return canned results for the queries issued by run_full_aggregation."""
+    if "COUNT(*) as count FROM steam_kpis" in sql:
+        # Return count for cleanup
+        return pd.DataFrame([{"count": 100}])
+    elif "COUNT(*) as count FROM hourly_kpis" in sql:
+        # Return count for hourly KPI cleanup
+        return pd.DataFrame([{"count": 50}])
+    elif "FROM game_metadata" in sql:
+        # Return metadata for export_game_metadata
+        return pd.DataFrame(
+            [
+                {
+                    "app_id": 730,
+                    "name": "Counter-Strike 2",
+                    "type": "game",
+                    "description": "Test game",
+                    "developers": '["Valve"]',
+                    "publishers": '["Valve"]',
+                    "is_free": True,
+                    "required_age": 0,
+                    "release_date": "2012-08-21",
+                    "platforms": '["windows"]',
+                    "metacritic_score": None,
+                    "metacritic_url": None,
+                    "categories": '["Multi-player"]',
+                    "genres": '["Action"]',
+                    "price_info": '{"price": 0, "currency": "USD"}',
+                    "tags": '{"FPS": 1000}',
+                }
+            ]
+        )
+    else:
+        # Return empty DataFrame for other queries
+        return pd.DataFrame()
 
 
 class TestKPIAggregator:
@@ -65,22 +150,22 @@ class TestKPIAggregator:
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
         # Test the SQL generation - create_daily_kpis() calls all 3 source methods
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.create_daily_kpis()
+        aggregator.db_manager = mock_db_manager
+        aggregator.create_daily_kpis()
 
-        # Verify query was called 6 times (3 sources × 2 queries each: CREATE + INSERT)
-        assert mock_db_manager.query.call_count == 6
+        # Verify query was called 7 times (3 sources × 2 queries each: CREATE + INSERT)
+        # plus the steam_rankings refresh
+        assert mock_db_manager.query.call_count == 7
 
         # Verify Steam table creation
         steam_create_call = mock_db_manager.query.call_args_list[0][0][0]
-        assert "CREATE TABLE IF NOT EXISTS steam_daily_kpis" in steam_create_call
-        assert "PRIMARY KEY (date, steam_app_id)" in steam_create_call
+        missing = [f for f in _STEAM_DAILY_CREATE_FRAGMENTS if f not in steam_create_call]
+        assert not missing, missing
 
         # Verify Steam data insert
         steam_insert_call = mock_db_manager.query.call_args_list[1][0][0]
-        assert "INSERT OR REPLACE INTO steam_daily_kpis" in steam_insert_call
-        assert "FROM steam_raw s" in steam_insert_call
-        assert "LEFT JOIN game_metadata m ON s.steam_app_id = m.steam_app_id" in steam_insert_call
+        missing = [f for f in _STEAM_DAILY_INSERT_FRAGMENTS if f not in steam_insert_call]
+        assert not missing, missing
 
         # Verify Twitch table creation
         twitch_create_call = mock_db_manager.query.call_args_list[2][0][0]
@@ -90,14 +175,19 @@ class TestKPIAggregator:
         igdb_create_call = mock_db_manager.query.call_args_list[4][0][0]
         assert "CREATE TABLE IF NOT EXISTS igdb_ratings_snapshot" in igdb_create_call
 
+        # Verify rankings are materialized from the daily table
+        rankings_call = mock_db_manager.query.call_args_list[6][0][0]
+        missing = [f for f in _RANKINGS_TABLE_FRAGMENTS if f not in rankings_call]
+        assert not missing, missing
+
     def test_export_latest_kpis(self, mock_db_manager, tmp_path):
         """Test export of latest Steam daily KPIs."""
         output_path = tmp_path / "steam_daily_kpis.json"
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_steam_daily_kpis(output_path=output_path, days=30)
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_steam_daily_kpis(output_path=output_path, days=30)
 
         # Verify export_to_json was called
         mock_db_manager.export_to_json.assert_called_once()
@@ -115,8 +205,8 @@ class TestKPIAggregator:
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_steam_rankings(output_path=output_path)
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_steam_rankings(output_path=output_path)
 
         # Verify export_to_json was called
         mock_db_manager.export_to_json.assert_called_once()
@@ -124,9 +214,45 @@ class TestKPIAggregator:
         # Check the query parameter
         call_kwargs = mock_db_manager.export_to_json.call_args[1]
         assert "query" in call_kwargs
-        assert "AVG(peak_ccu) as avg_peak_ccu" in call_kwargs["query"]
-        assert "FROM steam_daily_kpis" in call_kwargs["query"]
-        assert "GROUP BY game_name, steam_app_id, igdb_id" in call_kwargs["query"]
+        missing = [f for f in _RANKINGS_EXPORT_FRAGMENTS if f not in call_kwargs["query"]]
+        assert not missing, missing
+        assert "GROUP BY" not in call_kwargs["query"]
+
+    @pytest.mark.parametrize("read_only", [True, False])
+    def test_export_rankings_without_rankings_table(self, tmp_path, read_only):
+        """Test rankings exports on a database aggregated before steam_rankings existed."""
+        db_path = tmp_path / "test.db"
+        with duckdb.connect(str(db_path)) as conn:
+            conn.execute("""
+                CREATE TABLE steam_daily_kpis AS
+                SELECT * FROM (VALUES
+                    (DATE '2025-10-21', 730, 1, 'Counter-Strike 2', 100, 80, 90, 0),
+                    (DATE '2025-10-22', 730, 1, 'Counter-Strike 2', 300, 200, 90, 0)
+                ) v(date, steam_app_id, igdb_id, game_name, peak_ccu, avg_ccu,
+                    avg_metacritic_score, avg_price_cents)
+            """)
+            conn.execute("""
+                CREATE TABLE twitch_daily_kpis (
+                    date DATE, twitch_game_id VARCHAR, igdb_id INTEGER, game_name VARCHAR,
+                    peak_viewers INTEGER, avg_viewers DOUBLE, avg_channels DOUBLE
+                )
+            """)
+
+        with KPIAggregator(db_path=db_path, read_only=read_only) as aggregator:
+            aggregator.export_steam_rankings(output_path=tmp_path / "steam.json")
+            aggregator.export_unified_rankings(output_path=tmp_path / "unified.json")
+
+        steam = json.loads((tmp_path / "steam.json").read_text())
+        unified = json.loads((tmp_path / "unified.json").read_text())
+        assert [(r["steam_app_id"], r["avg_peak_ccu"], r["days_tracked"]) for r in steam] == [
+            (730, 200.0, 2)
+        ]
+        assert unified[0]["all_time_peak_ccu"] == 300
+
+        # Writable databases get the table created on the spot
+        with duckdb.connect(str(db_path), read_only=True) as conn:
+            tables = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+        assert ("steam_rankings" in tables) is not read_only
 
     def test_export_unified_daily_kpis(self, mock_db_manager, tmp_path):
         """Test export of unified daily KPIs (Steam + Twitch + IGDB)."""
@@ -134,71 +260,35 @@ class TestKPIAggregator:
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_unified_daily_kpis(output_path=output_path, days=30)
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_unified_daily_kpis(output_path=output_path, days=30)
 
         # Verify export_to_json was called with query
         mock_db_manager.export_to_json.assert_called_once()
         call_kwargs = mock_db_manager.export_to_json.call_args[1]
         assert "query" in call_kwargs
-        assert "FROM steam_daily_kpis s" in call_kwargs["query"]
-        assert "FULL OUTER JOIN twitch_daily_kpis t" in call_kwargs["query"]
-        assert "FULL OUTER JOIN igdb_ratings_snapshot i" in call_kwargs["query"]
+        missing = [f for f in _UNIFIED_FRAGMENTS if f not in call_kwargs["query"]]
+        assert not missing, missing
 
     def test_run_full_aggregation(self, mock_db_manager, tmp_path):
         """Test full aggregation pipeline."""
         output_dir = tmp_path / "exports"
 
-        # Mock different return values based on query
-        def query_side_effect(sql):
-            if "COUNT(*) as count FROM steam_raw" in sql:
-                # Return count for cleanup
-                return pd.DataFrame([{"count": 100}])
-            elif "COUNT(*) as count FROM hourly_kpis" in sql:
-                # Return count for hourly KPI cleanup
-                return pd.DataFrame([{"count": 50}])
-            elif "FROM game_metadata" in sql:
-                # Return metadata for export_game_metadata
-                return pd.DataFrame(
-                    [
-                        {
-                            "app_id": 730,
-                            "name": "Counter-Strike 2",
-                            "type": "game",
-                            "description": "Test game",
-                            "developers": '["Valve"]',
-                            "publishers": '["Valve"]',
-                            "is_free": True,
-                            "required_age": 0,
-                            "release_date": "2012-08-21",
-                            "platforms": '["windows"]',
-                            "metacritic_score": None,
-                            "metacritic_url": None,
-                            "categories": '["Multi-player"]',
-                            "genres": '["Action"]',
-                            "price_info": '{"price": 0, "currency": "USD"}',
-                            "tags": '{"FPS": 1000}',
-                        }
-                    ]
-                )
-            else:
-                # Return empty DataFrame for other queries
-                return pd.DataFrame()
-
         mock_db_manager.query.side_effect = query_side_effect
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.run_full_aggregation(output_dir=output_dir)
+        aggregator.db_manager = mock_db_manager
+        # Keep the Parquet retention sweep off the real data/raw/steam directory
+        aggregator.cleanup_old_parquet_files = MagicMock(return_value=0)
+        aggregator.run_full_aggregation(output_dir=output_dir)
 
         # Verify all methods were called
         assert mock_db_manager.query.called  # create_daily_kpis and others
         assert (
-            mock_db_manager.export_to_json.call_count == 9
-        )  # 9 exports: steam_rankings, twitch_rankings, unified_rankings,
-        #  steam_daily_kpis, twitch_daily_kpis, igdb_ratings_snapshot,
-        #  unified_daily_kpis, hourly_kpis, monthly_kpis_limited
+            mock_db_manager.export_to_json.call_count == 14
+        )  # 14 exports: steam/twitch/unified rankings, steam/twitch/igdb/unified daily,
+        #  steam/twitch/igdb weekly, steam/twitch/igdb monthly, hourly_kpis
         #  (game_metadata uses json.dump directly, not export_to_json)
 
         # Verify output directory was created
@@ -213,8 +303,8 @@ class TestKPIAggregator:
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_steam_daily_kpis(output_path=output_path, days=30)
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_steam_daily_kpis(output_path=output_path, days=30)
 
         # Check that the query filters by date
         call_kwargs = mock_db_manager.export_to_json.call_args[1]
@@ -230,58 +320,43 @@ class TestKPIAggregator:
             assert aggregator is not None
             assert hasattr(aggregator, "db_manager")
 
-    def test_export_weekly_kpis(self, mock_db_manager, tmp_path):
-        """Test export of weekly KPIs."""
-        output_path = tmp_path / "weekly_kpis.json"
+    def test_export_steam_weekly_kpis(self, mock_db_manager, tmp_path):
+        """Test export of Steam weekly KPIs restricted to the last N weeks."""
+        output_path = tmp_path / "steam_weekly_kpis.json"
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_weekly_kpis(output_path=output_path)
-
-        # Verify export_to_json was called with correct parameters
-        mock_db_manager.export_to_json.assert_called_once_with(
-            table_name="weekly_kpis", output_path=output_path
-        )
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_steam_weekly_kpis(output_path=output_path, weeks=12)
 
-    def test_export_monthly_kpis(self, mock_db_manager, tmp_path):
-        """Test export of all monthly KPIs."""
-        output_path = tmp_path / "monthly_kpis.json"
-        aggregator = KPIAggregator(db_path=Path("test.db"))
-
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_monthly_kpis(output_path=output_path)
-
-        # Verify export_to_json was called with correct parameters
-        mock_db_manager.export_to_json.assert_called_once_with(
-            table_name="monthly_kpis", output_path=output_path
-        )
+        call_kwargs = mock_db_manager.export_to_json.call_args[1]
+        assert call_kwargs["output_path"] == output_path
+        assert "FROM steam_weekly_kpis" in call_kwargs["query"]
+        assert "INTERVAL '12' WEEK" in call_kwargs["query"]
 
-    def test_export_monthly_kpis_limited(self, mock_db_manager, tmp_path):
-        """Test export of limited monthly KPIs (last N months)."""
-        output_path = tmp_path / "monthly_kpis.json"
+    def test_export_steam_monthly_kpis(self, mock_db_manager, tmp_path):
+        """Test export of Steam monthly KPIs restricted to the last N months."""
+        output_path = tmp_path / "steam_monthly_kpis.json"
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_monthly_kpis_limited(output_path=output_path, months=12)
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_steam_monthly_kpis(output_path=output_path, months=12)
 
-        # Verify export_to_json was called with a query
-        assert mock_db_manager.export_to_json.called
         call_kwargs = mock_db_manager.export_to_json.call_args[1]
-        assert "query" in call_kwargs
+        assert call_kwargs["output_path"] == output_path
+        assert "FROM steam_monthly_kpis" in call_kwargs["query"]
         assert "INTERVAL '12' MONTH" in call_kwargs["query"]
 
     def test_export_hourly_kpis(self, mock_db_manager, tmp_path):
-        """Test export of hourly KPIs with time limit."""
+        """Test export of hourly KPIs restricted to the last N hours."""
         output_path = tmp_path / "hourly_kpis.json"
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            aggregator.export_hourly_kpis(output_path=output_path, hours=48)
+        aggregator.db_manager = mock_db_manager
+        aggregator.export_hourly_kpis(output_path=output_path, hours=48)
 
         # Verify export_to_json was called with a query
-        assert mock_db_manager.export_to_json.called
+        mock_db_manager.export_to_json.assert_called_once()
         call_kwargs = mock_db_manager.export_to_json.call_args[1]
-        assert "query" in call_kwargs
         assert "INTERVAL '48' HOUR" in call_kwargs["query"]
 
     def test_export_methods_handle_none_db_manager(self, tmp_path):
@@ -293,10 +368,11 @@ class TestKPIAggregator:
         aggregator.db_manager = None
 
         # These should not raise exceptions
-        aggregator.export_weekly_kpis(output_path=output_path)
-        aggregator.export_monthly_kpis(output_path=output_path)
-        aggregator.export_monthly_kpis_limited(output_path=output_path, months=12)
+        aggregator.export_steam_weekly_kpis(output_path=output_path, weeks=12)
+        aggregator.export_steam_monthly_kpis(output_path=output_path, months=12)
+        aggregator.export_steam_rankings(output_path=output_path)
         aggregator.export_hourly_kpis(output_path=output_path, hours=48)
+        assert not output_path.exists()
 
     def test_cleanup_old_raw_data(self, mock_db_manager):
         """Test cleanup of old raw data."""
@@ -309,8 +385,8 @@ class TestKPIAggregator:
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            rows_deleted = aggregator.cleanup_old_raw_data(retention_days=7)
+        aggregator.db_manager = mock_db_manager
+        rows_deleted = aggregator.cleanup_old_raw_data(retention_days=7)
 
         # Verify query was called 3 times (count before, delete, count after)
         assert mock_db_manager.query.call_count == 3
@@ -327,8 +403,8 @@ class TestKPIAggregator:
 
         aggregator = KPIAggregator(db_path=Path("test.db"))
 
-        with patch.object(aggregator, "db_manager", mock_db_manager):
-            rows_deleted = aggregator.cleanup_old_hourly_kpis(retention_days=7)
+        aggregator.db_manager = mock_db_manager
+        rows_deleted = aggregator.cleanup_old_hourly_kpis(retention_days=7)
 
         # Verify query was called 3 times
         assert mock_db_manager.query.call_count == 3
@@ -1,36 +1,66 @@
 """Tests for cleanup utility - 30-day retention policy."""
 
+import os
 import time
+from datetime import UTC, datetime
 from pathlib import Path
 
 import pytest
 
 from python.utils.cleanup import cleanup_old_data
 
+_DAY = 86_400
+
+
+def _old(days: int) -> float:
+    """Return a timestamp the given number of days in the past."""
+    return time.time() - days * _DAY
+
+
+def _touch_bytes(path: Path, content: bytes = b"x") -> None:
+    """Write a small fixture file with a raw fd, bypassing text-mode file objects."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+
+
+def _age_files(parent: Path, names: list[str], days: int) -> None:
+    """Set access and modification times of files in one directory to N days ago."""
+    old_time = _old(days)
+    fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for name in names:
+            os.utime(name, (old_time, old_time), dir_fd=fd, follow_symlinks=False)
+    finally:
+        os.close(fd)
+
+
+@pytest.fixture
+def steam_dir(tmp_path: Path) -> Path:
+    """Create the raw Steam data directory."""
+    data_dir = tmp_path / "data" / "raw" / "steam"
+    data_dir.mkdir(parents=True)
+    return data_dir
+
 
 class TestCleanup:
     """Test suite for data cleanup utility."""
 
-    def test_cleanup_old_parquet_files(self, tmp_path: Path) -> None:
+    def test_cleanup_old_parquet_files(self, steam_dir: Path) -> None:
         """Test that old Parquet files are deleted."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
         # Create old file (40 days old)
-        old_file = data_dir / "old.parquet"
-        old_file.write_text("old data")
-        old_time = time.time() - (40 * 24 * 60 * 60)  # 40 days ago
-        Path(old_file).touch()
-        import os
-
-        os.utime(old_file, (old_time, old_time))
+        old_file = steam_dir / "old.parquet"
+        _touch_bytes(old_file, b"old data")
+        _age_files(steam_dir, ["old.parquet"], 40)  # 40 days ago
 
         # Create recent file (10 days old)
-        recent_file = data_dir / "recent.parquet"
-        recent_file.write_text("recent data")
+        recent_file = steam_dir / "recent.parquet"
+        _touch_bytes(recent_file, b"recent data")
 
         # Cleanup files older than 30 days
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30)
 
         # Verify old file deleted, recent file kept
         assert not old_file.exists()
@@ -47,20 +77,16 @@ class TestCleanup:
         old_partition.mkdir(parents=True)
         old_file1 = old_partition / "data_abc.parquet"
         old_file2 = old_partition / "data_def.parquet"
-        old_file1.write_text("old")
-        old_file2.write_text("old")
-
-        old_time = time.time() - (35 * 24 * 60 * 60)
-        import os
+        _touch_bytes(old_file1, b"old")
+        _touch_bytes(old_file2, b"old")
 
-        for f in [old_file1, old_file2]:
-            os.utime(f, (old_time, old_time))
+        _age_files(old_partition, ["data_abc.parquet", "data_def.parquet"], 35)
 
         # Create recent partitioned files (5 days old)
         recent_partition = base_dir / "date=2025-10-17" / "game_id=730"
         recent_partition.mkdir(parents=True)
         recent_file = recent_partition / "data_xyz.parquet"
-        recent_file.write_text("recent")
+        _touch_bytes(recent_file, b"recent")
 
         # Cleanup
         result = cleanup_old_data(base_path=base_dir, days_to_keep=30)
@@ -73,78 +99,59 @@ class TestCleanup:
         # Verify recent file kept
         assert recent_file.exists()
 
-    def test_cleanup_no_files_to_delete(self, tmp_path: Path) -> None:
+    def test_cleanup_no_files_to_delete(self, steam_dir: Path) -> None:
         """Test cleanup when all files are recent."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
         # Create only recent files
         for i in range(5):
-            file = data_dir / f"recent_{i}.parquet"
-            file.write_text(f"data {i}")
+            file = steam_dir / f"recent_{i}.parquet"
+            _touch_bytes(file, f"data {i}".encode())
 
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30)
 
         # Verify nothing deleted
         assert result["files_deleted"] == 0
         assert result["bytes_freed"] == 0
-        assert len(list(data_dir.rglob("*.parquet"))) == 5
+        assert len(list(steam_dir.rglob("*.parquet"))) == 5
 
-    def test_cleanup_empty_directory(self, tmp_path: Path) -> None:
+    def test_cleanup_empty_directory(self, steam_dir: Path) -> None:
         """Test cleanup on empty directory."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30)
 
         assert result["files_deleted"] == 0
         assert result["bytes_freed"] == 0
 
-    def test_cleanup_with_custom_retention_days(self, tmp_path: Path) -> None:
+    def test_cleanup_with_custom_retention_days(self, steam_dir: Path) -> None:
         """Test cleanup with different retention periods."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
         # Create file 10 days old
-        file = data_dir / "data.parquet"
-        file.write_text("data")
-        old_time = time.time() - (10 * 24 * 60 * 60)
-        import os
-
-        os.utime(file, (old_time, old_time))
+        file = steam_dir / "data.parquet"
+        _touch_bytes(file, b"data")
+        _age_files(steam_dir, ["data.parquet"], 10)
 
         # With 30-day retention: file should be kept
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30)
         assert result["files_deleted"] == 0
         assert file.exists()
 
         # With 7-day retention: file should be deleted
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=7)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=7)
         assert result["files_deleted"] == 1
         assert not file.exists()
 
-    def test_cleanup_only_parquet_files(self, tmp_path: Path) -> None:
+    def test_cleanup_only_parquet_files(self, steam_dir: Path) -> None:
         """Test that cleanup only deletes .parquet files, not other files."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
         # Create old files of different types
-        old_time = time.time() - (40 * 24 * 60 * 60)
-        import os
+        old_parquet = steam_dir / "old.parquet"
+        _touch_bytes(old_parquet, b"old parquet")
 
-        old_parquet = data_dir / "old.parquet"
-        old_parquet.write_text("old parquet")
-        os.utime(old_parquet, (old_time, old_time))
+        old_json = steam_dir / "old.json"
+        _touch_bytes(old_json, b"{}")
 
-        old_json = data_dir / "old.json"
-        old_json.write_text("{}")
-        os.utime(old_json, (old_time, old_time))
+        old_txt = steam_dir / "old.txt"
+        _touch_bytes(old_txt, b"text")
 
-        old_txt = data_dir / "old.txt"
-        old_txt.write_text("text")
-        os.utime(old_txt, (old_time, old_time))
+        _age_files(steam_dir, ["old.parquet", "old.json", "old.txt"], 40)
 
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30)
 
         # Only .parquet file should be deleted
         assert not old_parquet.exists()
@@ -152,22 +159,15 @@ class TestCleanup:
         assert old_txt.exists()
         assert result["files_deleted"] == 1
 
-    def test_cleanup_calculates_bytes_freed(self, tmp_path: Path) -> None:
+    def test_cleanup_calculates_bytes_freed(self, steam_dir: Path) -> None:
         """Test that cleanup correctly calculates bytes freed."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
         # Create old file with known size
-        old_file = data_dir / "old.parquet"
-        content = "x" * 1024  # 1 KB
-        old_file.write_text(content)
+        old_file = steam_dir / "old.parquet"
+        _touch_bytes(old_file, b"x" * 1024)  # 1 KB
 
-        old_time = time.time() - (40 * 24 * 60 * 60)
-        import os
+        _age_files(steam_dir, ["old.parquet"], 40)
 
-        os.utime(old_file, (old_time, old_time))
-
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30)
 
         assert result["files_deleted"] == 1
         assert result["bytes_freed"] == 1024
@@ -187,12 +187,9 @@ class TestCleanup:
         old_partition = base_dir / "date=2024-09-15" / "game_id=730"
         old_partition.mkdir(parents=True)
         old_file = old_partition / "data.parquet"
-        old_file.write_text("old")
-
-        old_time = time.time() - (40 * 24 * 60 * 60)
-        import os
+        _touch_bytes(old_file, b"old")
 
-        os.utime(old_file, (old_time, old_time))
+        _age_files(old_partition, ["data.parquet"], 40)
 
         result = cleanup_old_data(base_path=base_dir, days_to_keep=30, remove_empty_dirs=True)
 
@@ -204,23 +201,52 @@ class TestCleanup:
         assert not old_partition.exists()
         assert not (base_dir / "date=2024-09-15").exists()
 
-    def test_cleanup_dry_run_mode(self, tmp_path: Path) -> None:
+    def test_cleanup_dry_run_mode(self, steam_dir: Path) -> None:
         """Test cleanup in dry-run mode (no actual deletion)."""
-        data_dir = tmp_path / "data" / "raw" / "steam"
-        data_dir.mkdir(parents=True)
-
         # Create old file
-        old_file = data_dir / "old.parquet"
-        old_file.write_text("old data")
-        old_time = time.time() - (40 * 24 * 60 * 60)
-        import os
-
-        os.utime(old_file, (old_time, old_time))
+        old_file = steam_dir / "old.parquet"
+        _touch_bytes(old_file, b"old data")
+        _age_files(steam_dir, ["old.parquet"], 40)
 
         # Run in dry-run mode
-        result = cleanup_old_data(base_path=data_dir, days_to_keep=30, dry_run=True)
+        result = cleanup_old_data(base_path=steam_dir, days_to_keep=30, dry_run=True)
 
         # Verify file NOT deleted but counted
         assert old_file.exists()
         assert result["files_deleted"] == 1
         assert result["bytes_freed"] > 0
+
+    def test_cleanup_skips_recent_date_partitions(self, tmp_path: Path) -> None:
+        """Test that partitions dated after the cutoff are not scanned."""
+        base_dir = tmp_path / "data" / "raw" / "steam"
+
+        # Recent partition holding a file with an old mtime (e.g. copied from a backup)
+        today = datetime.now(UTC).strftime("%Y-%m-%d")
+        recent_partition = base_dir / f"date={today}" / "game_id=730"
+        recent_partition.mkdir(parents=True)
+        recent_file = recent_partition / "data.parquet"
+        _touch_bytes(recent_file, b"recent")
+
+        _age_files(recent_partition, ["data.parquet"], 40)
+
+        result = cleanup_old_data(base_path=base_dir, days_to_keep=30)
+
+        # Partition date wins over mtime
+        assert result["files_deleted"] == 0
+        assert recent_file.exists()
+
+    def test_cleanup_keeps_non_empty_partition_directories(self, tmp_path: Path) -> None:
+        """Test that partition directories still holding files are not removed."""
+        base_dir = tmp_path / "data" / "raw" / "steam"
+
+        # Old and recent file side by side in the same partition
+        partition = base_dir / "date=2024-09-15" / "game_id=730"
+        partition.mkdir(parents=True)
+        _touch_bytes(partition / "old.parquet", b"old")
+        _touch_bytes(partition / "recent.parquet", b"recent")
+        _age_files(partition, ["old.parquet"], 40)
+
+        result = cleanup_old_data(base_path=base_dir, days_to_keep=30, remove_empty_dirs=True)
+
+        assert result["files_deleted"] == 1
+        assert (partition / "recent.parquet").exists()
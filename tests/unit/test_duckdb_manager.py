@@ -1,12 +1,58 @@
 """Tests for DuckDB manager."""
 
+from collections.abc import Iterator
+from datetime import datetime
 from pathlib import Path
 
+import duckdb
 import pandas as pd
+import pyarrow as pa
+import pytest
 
 from python.storage.duckdb_manager import DuckDBManager
 
 
+def _mk_table(names: list[str], counts: list[int], timestamps: list[str]) -> pa.Table:
+    """Build a Steam snapshot table directly in Arrow, skipping pandas parsing."""
+    return pa.table(
+        {
+            "game_name": pa.array(names),
+            "player_count": pa.array(counts, type=pa.int64()),
+            "timestamp": pa.array(
+                [datetime.fromisoformat(t) for t in timestamps], type=pa.timestamp("us")
+            ),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def cs2_dota_table() -> pa.Table:
+    """Two-game snapshot shared by tests in this module (Arrow tables are immutable)."""
+    return _mk_table(
+        ["Counter-Strike 2", "Dota 2"],
+        [1102182, 620592],
+        ["2025-10-22 14:00:00", "2025-10-22 14:00:00"],
+    )
+
+
+@pytest.fixture(scope="module")
+def shared_manager(tmp_path_factory: pytest.TempPathFactory) -> Iterator[DuckDBManager]:
+    """DuckDBManager opened once for the tests in this module."""
+    manager = DuckDBManager(db_path=tmp_path_factory.mktemp("duckdb") / "test.db")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def manager(shared_manager: DuckDBManager) -> Iterator[DuckDBManager]:
+    """Shared DuckDBManager with each test wrapped in a rolled-back transaction."""
+    shared_manager.conn.execute("BEGIN TRANSACTION")
+    try:
+        yield shared_manager
+    finally:
+        shared_manager.conn.execute("ROLLBACK")
+
+
 class TestDuckDBManager:
     """Test suite for DuckDBManager class."""
 
@@ -18,72 +64,101 @@ class TestDuckDBManager:
 
         assert db_path.exists()
 
-    def test_append_data_creates_table_and_inserts(self, tmp_path: Path) -> None:
+    def test_append_data_creates_table_and_inserts(
+        self, manager: DuckDBManager, cs2_dota_table: pa.Table
+    ) -> None:
         """Test appending data creates table and inserts rows."""
-        db_path = tmp_path / "test.db"
-        manager = DuckDBManager(db_path=db_path)
-
-        # Create test data
-        df = pd.DataFrame(
-            {
-                "game_name": ["Counter-Strike 2", "Dota 2"],
-                "player_count": [1102182, 620592],
-                "timestamp": pd.to_datetime(["2025-10-22 14:00:00", "2025-10-22 14:00:00"]),
-            }
-        )
-
         # Append data
-        manager.append_data(df, table_name="steam_data")
+        manager.append_data(cs2_dota_table, table_name="steam_data")
 
         # Verify data was inserted
-        result = manager.query("SELECT COUNT(*) as count FROM steam_data")
-        assert result.iloc[0]["count"] == 2
-
-        manager.close()
+        assert manager.scalar("SELECT COUNT(*) FROM steam_data") == 2
 
-    def test_append_data_multiple_times(self, tmp_path: Path) -> None:
+    def test_append_data_multiple_times(self, manager: DuckDBManager) -> None:
         """Test appending data multiple times accumulates rows."""
-        db_path = tmp_path / "test.db"
-        manager = DuckDBManager(db_path=db_path)
+        table1 = _mk_table(["Counter-Strike 2"], [1102182], ["2025-10-22 14:00:00"])
+
+        table2 = _mk_table(["Dota 2"], [620592], ["2025-10-22 15:00:00"])
+
+        manager.append_data(table1, table_name="steam_data")
+        manager.append_data(table2, table_name="steam_data")
 
-        df1 = pd.DataFrame(
+        assert manager.scalar("SELECT COUNT(*) FROM steam_data") == 2
+
+    def test_append_arrow_table(self, manager: DuckDBManager) -> None:
+        """Test that Arrow tables are ingested with their column types intact."""
+        table = pa.Table.from_pydict(
             {
-                "game_name": ["Counter-Strike 2"],
-                "player_count": [1102182],
-                "timestamp": pd.to_datetime(["2025-10-22 14:00:00"]),
+                "app_id": pa.array([730, 570], type=pa.int32()),
+                "player_count": pa.array([1102182, 620592], type=pa.int64()),
+                "timestamp": pa.array(
+                    [datetime(2025, 10, 22, 14), datetime(2025, 10, 22, 14)],
+                    type=pa.timestamp("us"),
+                ),
             }
         )
 
-        df2 = pd.DataFrame(
+        manager.append_data(table, table_name="steam_data")
+
+        columns = manager.conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = 'steam_data' ORDER BY ordinal_position"
+        ).fetchall()
+        assert columns == [
+            ("app_id", "INTEGER"),
+            ("player_count", "BIGINT"),
+            ("timestamp", "TIMESTAMP"),
+        ]
+        assert manager.scalar("SELECT SUM(player_count) FROM steam_data") == 1722774
+        dota_players = manager.scalar("SELECT player_count FROM steam_data WHERE app_id = ?", [570])
+        assert dota_players == 620592
+
+    def test_append_data_recreates_dropped_table(self, manager: DuckDBManager) -> None:
+        """Test appending after the table was dropped recreates it."""
+        table = _mk_table(["Counter-Strike 2"], [1102182], ["2025-10-22 14:00:00"])
+
+        manager.append_data(table, table_name="steam_data")
+        manager.conn.execute("DROP TABLE steam_data")
+        manager.append_data(table, table_name="steam_data")
+
+        assert manager.scalar("SELECT COUNT(*) FROM steam_data") == 1
+
+    def test_append_parquet_creates_table_and_inserts(
+        self, manager: DuckDBManager, tmp_path: Path
+    ) -> None:
+        """Test appending Parquet files scans them directly into a table."""
+        parquet_path = tmp_path / "steam.parquet"
+        pd.DataFrame(
             {
-                "game_name": ["Dota 2"],
-                "player_count": [620592],
-                "timestamp": pd.to_datetime(["2025-10-22 15:00:00"]),
+                "game_name": ["Counter-Strike 2", "Dota 2"],
+                "player_count": [1102182, 620592],
             }
-        )
+        ).to_parquet(parquet_path)
 
-        manager.append_data(df1, table_name="steam_data")
-        manager.append_data(df2, table_name="steam_data")
+        manager.append_parquet(parquet_path, table_name="steam_data")
+        manager.append_parquet(parquet_path, table_name="steam_data")
 
-        result = manager.query("SELECT COUNT(*) as count FROM steam_data")
-        assert result.iloc[0]["count"] == 2
+        assert manager.scalar("SELECT COUNT(*) FROM steam_data") == 4
 
-        manager.close()
+    def test_create_parquet_view_reads_partitions(
+        self, manager: DuckDBManager, tmp_path: Path
+    ) -> None:
+        """Test that a Parquet view exposes hive partition columns."""
+        for app_id, player_count in [(730, 1102182), (570, 620592)]:
+            partition = tmp_path / "steam" / f"game_id={app_id}"
+            partition.mkdir(parents=True)
+            pd.DataFrame({"player_count": [player_count]}).to_parquet(partition / "data.parquet")
 
-    def test_query_returns_dataframe(self, tmp_path: Path) -> None:
-        """Test that query returns a pandas DataFrame."""
-        db_path = tmp_path / "test.db"
-        manager = DuckDBManager(db_path=db_path)
+        manager.create_parquet_view("steam_raw", tmp_path / "steam" / "**" / "*.parquet")
 
-        df = pd.DataFrame(
-            {
-                "game_name": ["Counter-Strike 2", "Dota 2"],
-                "player_count": [1102182, 620592],
-                "timestamp": pd.to_datetime(["2025-10-22 14:00:00", "2025-10-22 14:00:00"]),
-            }
-        )
+        result = manager.query("SELECT player_count FROM steam_raw WHERE game_id = 570")
+        assert result["player_count"].tolist() == [620592]
 
-        manager.append_data(df, table_name="steam_data")
+    def test_query_returns_dataframe(
+        self, manager: DuckDBManager, cs2_dota_table: pa.Table
+    ) -> None:
+        """Test that query returns a pandas DataFrame."""
+        manager.append_data(cs2_dota_table, table_name="steam_data")
 
         # Query with filtering
         result = manager.query("SELECT * FROM steam_data WHERE game_name = 'Counter-Strike 2'")
@@ -93,28 +168,45 @@ class TestDuckDBManager:
         assert result.iloc[0]["game_name"] == "Counter-Strike 2"
         assert result.iloc[0]["player_count"] == 1102182
 
-        manager.close()
+    def test_query_dtypes_match_duckdb_df(self, manager: DuckDBManager) -> None:
+        """Test that query() returns the same pandas dtypes as DuckDB's own .df()."""
+        sql = """
+            SELECT
+                SUM(player_count) AS total_players,
+                DATE '2025-10-22' AS date,
+                MAX(steam_app_id) AS steam_app_id,
+                MAX(player_count) AS max_players
+            FROM (VALUES (1102182, NULL::INTEGER), (620592, NULL::INTEGER)) t(player_count, steam_app_id)
+        """
 
-    def test_query_with_aggregation(self, tmp_path: Path) -> None:
-        """Test SQL query with aggregation functions."""
-        db_path = tmp_path / "test.db"
-        manager = DuckDBManager(db_path=db_path)
+        result = manager.query(sql)
 
-        df = pd.DataFrame(
-            {
-                "game_name": ["Counter-Strike 2", "Counter-Strike 2", "Dota 2"],
-                "player_count": [1000000, 1200000, 620592],
-                "timestamp": pd.to_datetime(
-                    [
-                        "2025-10-22 14:00:00",
-                        "2025-10-22 15:00:00",
-                        "2025-10-22 14:00:00",
-                    ]
-                ),
-            }
+        assert result.dtypes.to_dict() == manager.conn.execute(sql).df().dtypes.to_dict()
+        assert result["total_players"].dtype == "float64"  # HUGEINT/DECIMAL sum
+        assert result["date"].dtype == "datetime64[us]"
+        assert result["steam_app_id"].dtype == pd.Int32Dtype()  # NULL-only int column
+        assert result["max_players"].dtype == "int32"
+        assert result.iloc[0]["total_players"] == 1722774
+
+    def test_to_arrow_returns_table(self, manager: DuckDBManager, cs2_dota_table: pa.Table) -> None:
+        """Test that to_arrow returns query results as a pyarrow Table."""
+        manager.append_data(cs2_dota_table, table_name="steam_data")
+
+        result = manager.to_arrow("SELECT * FROM steam_data ORDER BY player_count DESC")
+
+        assert isinstance(result, pa.Table)
+        assert result.schema.field("player_count").type == pa.int64()
+        assert result.column("player_count").to_pylist() == [1102182, 620592]
+
+    def test_query_with_aggregation(self, manager: DuckDBManager) -> None:
+        """Test SQL query with aggregation functions."""
+        table = _mk_table(
+            ["Counter-Strike 2", "Counter-Strike 2", "Dota 2"],
+            [1000000, 1200000, 620592],
+            ["2025-10-22 14:00:00", "2025-10-22 15:00:00", "2025-10-22 14:00:00"],
         )
 
-        manager.append_data(df, table_name="steam_data")
+        manager.append_data(table, table_name="steam_data")
 
         result = manager.query(
             """
@@ -129,64 +221,41 @@ class TestDuckDBManager:
         )
 
         assert len(result) == 2
-        cs2_row = result[result["game_name"] == "Counter-Strike 2"].iloc[0]
+        # ORDER BY game_name puts Counter-Strike 2 first; no pandas mask needed
+        cs2_row = result.iloc[0]
+        assert cs2_row["game_name"] == "Counter-Strike 2"
         assert cs2_row["avg_players"] == 1100000
         assert cs2_row["max_players"] == 1200000
 
-        manager.close()
-
-    def test_export_to_json(self, tmp_path: Path) -> None:
+    def test_export_to_json(
+        self, manager: DuckDBManager, cs2_dota_table: pa.Table, tmp_path: Path
+    ) -> None:
         """Test exporting table to JSON file."""
-        db_path = tmp_path / "test.db"
         output_json = tmp_path / "output.json"
-        manager = DuckDBManager(db_path=db_path)
 
-        df = pd.DataFrame(
-            {
-                "game_name": ["Counter-Strike 2", "Dota 2"],
-                "player_count": [1102182, 620592],
-                "timestamp": pd.to_datetime(["2025-10-22 14:00:00", "2025-10-22 14:00:00"]),
-            }
-        )
-
-        manager.append_data(df, table_name="steam_data")
+        manager.append_data(cs2_dota_table, table_name="steam_data")
         manager.export_to_json(table_name="steam_data", output_path=output_json)
 
         # Verify JSON file exists and has correct content
         assert output_json.exists()
 
-        import json
-
-        with open(output_json) as f:
-            data = json.load(f)
-
-        assert len(data) == 2
-        assert data[0]["game_name"] == "Counter-Strike 2"
-        assert data[0]["player_count"] == 1102182
+        result = manager.query(f"SELECT * FROM read_json_auto('{output_json}')")
 
-        manager.close()
+        assert len(result) == 2
+        assert result.iloc[0]["game_name"] == "Counter-Strike 2"
+        assert result.iloc[0]["player_count"] == 1102182
 
-    def test_export_to_json_with_query(self, tmp_path: Path) -> None:
+    def test_export_to_json_with_query(self, manager: DuckDBManager, tmp_path: Path) -> None:
         """Test exporting with custom SQL query."""
-        db_path = tmp_path / "test.db"
         output_json = tmp_path / "filtered.json"
-        manager = DuckDBManager(db_path=db_path)
 
-        df = pd.DataFrame(
-            {
-                "game_name": ["Counter-Strike 2", "Dota 2", "PUBG"],
-                "player_count": [1102182, 620592, 284000],
-                "timestamp": pd.to_datetime(
-                    [
-                        "2025-10-22 14:00:00",
-                        "2025-10-22 14:00:00",
-                        "2025-10-22 14:00:00",
-                    ]
-                ),
-            }
+        table = _mk_table(
+            ["Counter-Strike 2", "Dota 2", "PUBG"],
+            [1102182, 620592, 284000],
+            ["2025-10-22 14:00:00", "2025-10-22 14:00:00", "2025-10-22 14:00:00"],
         )
 
-        manager.append_data(df, table_name="steam_data")
+        manager.append_data(table, table_name="steam_data")
 
         # Export only games with > 500k players
         manager.export_to_json(
@@ -194,83 +263,122 @@ class TestDuckDBManager:
             output_path=output_json,
         )
 
+        result = manager.query(f"SELECT * FROM read_json_auto('{output_json}')")
+
+        assert len(result) == 2
+        assert (result["player_count"] > 500000).all()
+
+    def test_export_to_json_nulls_and_dates(self, manager: DuckDBManager, tmp_path: Path) -> None:
+        """Test that non-finite floats export as null and dates as ISO strings."""
+        output_json = tmp_path / "kpis.json"
+
+        manager.export_to_json(
+            query="""
+                SELECT
+                    DATE '2025-10-22' as date,
+                    TIMESTAMP '2025-10-22 14:00:00' as hour,
+                    'nan'::DOUBLE as avg_metacritic_score,
+                    'inf'::DOUBLE as avg_price_cents,
+                    1102182.5 as avg_ccu
+            """,
+            output_path=output_json,
+        )
+
         import json
 
         with open(output_json) as f:
             data = json.load(f)
 
-        assert len(data) == 2
-        assert all(game["player_count"] > 500000 for game in data)
-
-        manager.close()
+        assert data == [
+            {
+                "date": "2025-10-22T00:00:00.000",
+                "hour": "2025-10-22T14:00:00.000",
+                "avg_metacritic_score": None,
+                "avg_price_cents": None,
+                "avg_ccu": 1102182.5,
+            }
+        ]
 
     def test_table_persistence_across_connections(self, tmp_path: Path) -> None:
         """Test that data persists when reopening database."""
         db_path = tmp_path / "test.db"
 
         # First connection: insert data
-        manager1 = DuckDBManager(db_path=db_path)
-        df = pd.DataFrame(
-            {
-                "game_name": ["Counter-Strike 2"],
-                "player_count": [1102182],
-                "timestamp": pd.to_datetime(["2025-10-22 14:00:00"]),
-            }
-        )
-        manager1.append_data(df, table_name="steam_data")
-        manager1.close()
+        with DuckDBManager(db_path=db_path) as manager1:
+            table = _mk_table(["Counter-Strike 2"], [1102182], ["2025-10-22 14:00:00"])
+            manager1.append_data(table, table_name="steam_data")
 
-        # Second connection: verify data exists
-        manager2 = DuckDBManager(db_path=db_path)
-        result = manager2.query("SELECT COUNT(*) as count FROM steam_data")
-        assert result.iloc[0]["count"] == 1
-        manager2.close()
+        # Second connection, read-only: verify data exists
+        with DuckDBManager(db_path=db_path, read_only=True) as manager2:
+            assert manager2.scalar("SELECT COUNT(*) FROM steam_data") == 1
+
+    def test_checkpoint_writes_wal_into_database_file(self, tmp_path: Path) -> None:
+        """Test that checkpoint() empties the write-ahead log while staying connected."""
+        db_path = tmp_path / "test.db"
+        wal_path = tmp_path / "test.db.wal"
+
+        with DuckDBManager(db_path=db_path) as manager:
+            manager.append_data(pd.DataFrame({"player_count": [1102182]}), table_name="steam_data")
+            assert wal_path.stat().st_size > 0
+
+            manager.checkpoint()
+
+            assert not wal_path.exists() or wal_path.stat().st_size == 0
+            assert manager.scalar("SELECT COUNT(*) FROM steam_data") == 1
+
+    def test_read_only_connection(self, tmp_path: Path) -> None:
+        """Test that a read-only connection can query but not write."""
+        db_path = tmp_path / "test.db"
+        with DuckDBManager(db_path=db_path) as manager:
+            manager.append_data(pd.DataFrame({"player_count": [1102182]}), table_name="steam_data")
+
+        with DuckDBManager(db_path=db_path, read_only=True) as manager:
+            result = manager.query("SELECT player_count FROM steam_data")
+            assert result.iloc[0]["player_count"] == 1102182
+
+            with pytest.raises(duckdb.InvalidInputException):
+                manager.query("CREATE TABLE other (id INTEGER)")
+
+    def test_connection_config(self, tmp_path: Path) -> None:
+        """Test that DuckDB settings are applied to the connection."""
+        config = {"threads": 2, "memory_limit": "512MB"}
+        with DuckDBManager(db_path=tmp_path / "test.db", config=config) as manager:
+            threads = manager.conn.execute("SELECT current_setting('threads')").fetchone()
+            assert threads == (2,)
 
     def test_context_manager(self, tmp_path: Path) -> None:
         """Test that DuckDBManager works as context manager."""
         db_path = tmp_path / "test.db"
 
         with DuckDBManager(db_path=db_path) as manager:
-            df = pd.DataFrame(
-                {
-                    "game_name": ["Counter-Strike 2"],
-                    "player_count": [1102182],
-                    "timestamp": pd.to_datetime(["2025-10-22 14:00:00"]),
-                }
-            )
-            manager.append_data(df, table_name="steam_data")
+            table = _mk_table(["Counter-Strike 2"], [1102182], ["2025-10-22 14:00:00"])
+            manager.append_data(table, table_name="steam_data")
 
         # Verify connection was closed properly and data persists
         with DuckDBManager(db_path=db_path) as manager:
-            result = manager.query("SELECT COUNT(*) as count FROM steam_data")
-            assert result.iloc[0]["count"] == 1
+            assert manager.scalar("SELECT COUNT(*) FROM steam_data") == 1
 
-    def test_create_game_metadata_table(self, tmp_path: Path) -> None:
+    def test_create_game_metadata_table(self, manager: DuckDBManager) -> None:
         """Test creating game_metadata table with correct schema."""
-        db_path = tmp_path / "test.db"
+        manager.create_game_metadata_table()
 
-        with DuckDBManager(db_path=db_path) as manager:
-            manager.create_game_metadata_table()
-
-            # Verify table exists and has correct columns
-            result = manager.query(
-                "SELECT column_name FROM information_schema.columns WHERE table_name = 'game_metadata' ORDER BY ordinal_position"
-            )
-            column_names = result["column_name"].tolist()
-
-            # Check that essential columns exist (new schema)
-            assert "igdb_id" in column_names
-            assert "game_name" in column_names
-            assert "steam_app_id" in column_names
-            assert "twitch_game_id" in column_names
-            assert "developers" in column_names
-            assert "genres" in column_names
-            assert "discovery_source" in column_names
-
-    def test_upsert_game_metadata(self, tmp_path: Path) -> None:
+        # Verify table exists and has correct columns
+        result = manager.query(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'game_metadata' ORDER BY ordinal_position"
+        )
+        column_names = result["column_name"].tolist()
+
+        # Check that essential columns exist (new schema)
+        assert "igdb_id" in column_names
+        assert "game_name" in column_names
+        assert "steam_app_id" in column_names
+        assert "twitch_game_id" in column_names
+        assert "developers" in column_names
+        assert "genres" in column_names
+        assert "discovery_source" in column_names
+
+    def test_upsert_game_metadata(self, manager: DuckDBManager) -> None:
         """Test upserting game metadata (insert or replace)."""
-        db_path = tmp_path / "test.db"
-
         game_metadata = {
             "igdb_id": 1234,
             "game_name": "Counter-Strike 2",
@@ -291,20 +399,17 @@ class TestDuckDBManager:
             "last_updated": "2025-10-23T10:00:00+00:00",
         }
 
-        with DuckDBManager(db_path=db_path) as manager:
-            manager.create_game_metadata_table()
-            manager.upsert_game_metadata(game_metadata)
+        manager.create_game_metadata_table()
+        manager.upsert_game_metadata(game_metadata)
 
-            # Verify data was inserted
-            result = manager.query("SELECT * FROM game_metadata WHERE igdb_id = 1234")
-            assert len(result) == 1
-            assert result.iloc[0]["game_name"] == "Counter-Strike 2"
-            assert result.iloc[0]["steam_app_id"] == 730
+        # Verify data was inserted
+        result = manager.query("SELECT * FROM game_metadata WHERE igdb_id = 1234")
+        assert len(result) == 1
+        assert result.iloc[0]["game_name"] == "Counter-Strike 2"
+        assert result.iloc[0]["steam_app_id"] == 730
 
-    def test_upsert_game_metadata_updates_existing(self, tmp_path: Path) -> None:
+    def test_upsert_game_metadata_updates_existing(self, manager: DuckDBManager) -> None:
         """Test that upserting existing game updates the record."""
-        db_path = tmp_path / "test.db"
-
         game_v1 = {
             "igdb_id": 1234,
             "game_name": "Counter-Strike 2",
@@ -333,29 +438,24 @@ class TestDuckDBManager:
             "last_updated": "2025-10-23T12:00:00+00:00",
         }
 
-        with DuckDBManager(db_path=db_path) as manager:
-            manager.create_game_metadata_table()
+        manager.create_game_metadata_table()
 
-            # Insert first version
-            manager.upsert_game_metadata(game_v1)
-            result1 = manager.query("SELECT COUNT(*) as count FROM game_metadata")
-            assert result1.iloc[0]["count"] == 1
+        # Insert first version
+        manager.upsert_game_metadata(game_v1)
+        assert manager.scalar("SELECT COUNT(*) FROM game_metadata") == 1
 
-            # Upsert second version (should update, not insert new row)
-            manager.upsert_game_metadata(game_v2)
-            result2 = manager.query("SELECT COUNT(*) as count FROM game_metadata")
-            assert result2.iloc[0]["count"] == 1
+        # Upsert second version (should update, not insert new row)
+        manager.upsert_game_metadata(game_v2)
+        assert manager.scalar("SELECT COUNT(*) FROM game_metadata") == 1
 
-            # Verify data was updated
-            result3 = manager.query("SELECT * FROM game_metadata WHERE igdb_id = 1234")
-            assert result3.iloc[0]["igdb_summary"] == "Updated description"
-            assert result3.iloc[0]["steam_metacritic_score"] == 85
-            assert result3.iloc[0]["twitch_game_id"] == "32399"
+        # Verify data was updated
+        result3 = manager.query("SELECT * FROM game_metadata WHERE igdb_id = 1234")
+        assert result3.iloc[0]["igdb_summary"] == "Updated description"
+        assert result3.iloc[0]["steam_metacritic_score"] == 85
+        assert result3.iloc[0]["twitch_game_id"] == "32399"
 
-    def test_get_game_metadata_by_app_id(self, tmp_path: Path) -> None:
+    def test_get_game_metadata_by_app_id(self, manager: DuckDBManager) -> None:
         """Test retrieving game metadata by igdb_id and steam_app_id."""
-        db_path = tmp_path / "test.db"
-
         game1 = {
             "igdb_id": 1234,
             "game_name": "Counter-Strike 2",
@@ -379,23 +479,21 @@ class TestDuckDBManager:
             "discovery_source": "igdb",
         }
 
-        with DuckDBManager(db_path=db_path) as manager:
-            manager.create_game_metadata_table()
-            manager.upsert_game_metadata(game1)
-            manager.upsert_game_metadata(game2)
-
-            # Get by igdb_id
-            result = manager.get_game_metadata(igdb_id=1234)
-            assert result is not None
-            assert result["game_name"] == "Counter-Strike 2"
-            assert result["igdb_id"] == 1234
-
-            # Get by steam_app_id
-            result2 = manager.get_game_metadata(steam_app_id=570)
-            assert result2 is not None
-            assert result2["game_name"] == "Dota 2"
-            assert result2["steam_app_id"] == 570
-
-            # Test non-existent game
-            result_none = manager.get_game_metadata(igdb_id=99999)
-            assert result_none is None
+        manager.create_game_metadata_table()
+        manager.upsert_game_metadata_many([game1, game2])
+
+        # Get by igdb_id
+        result = manager.get_game_metadata(igdb_id=1234)
+        assert result is not None
+        assert result["game_name"] == "Counter-Strike 2"
+        assert result["igdb_id"] == 1234
+
+        # Get by steam_app_id
+        result2 = manager.get_game_metadata(steam_app_id=570)
+        assert result2 is not None
+        assert result2["game_name"] == "Dota 2"
+        assert result2["steam_app_id"] == 570
+
+        # Test non-existent game
+        result_none = manager.get_game_metadata(igdb_id=99999)
+        assert result_none is None
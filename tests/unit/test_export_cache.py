@@ -0,0 +1,128 @@
+"""Tests for the JSON export cache."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from python.storage.duckdb_manager import DuckDBManager
+from python.storage.export_cache import ExportCache
+
+
+class TestExportCache:
+    """Test suite for ExportCache class."""
+
+    def test_key_changes_with_sql_and_database(self, tmp_path: Path) -> None:
+        """Test that the key depends on both the query and the database state."""
+        db_path = tmp_path / "test.db"
+        db_path.write_bytes(b"v1")
+        cache = ExportCache(cache_dir=tmp_path / "cache")
+
+        key = cache.key("SELECT 1", db_path)
+        assert cache.key("SELECT 1", db_path) == key
+        assert cache.key("SELECT 2", db_path) != key
+
+        db_path.write_bytes(b"v2-more-data")
+        assert cache.key("SELECT 1", db_path) != key
+
+    def test_key_changes_with_clock_for_relative_queries(self, tmp_path: Path) -> None:
+        """Test that time-relative queries miss the cache once the date or hour rolls over."""
+        db_path = tmp_path / "test.db"
+        db_path.write_bytes(b"v1")
+        cache = ExportCache(cache_dir=tmp_path / "cache")
+        now = datetime(2025, 10, 22, 14, 5)
+
+        daily = "SELECT * FROM daily_kpis WHERE date >= CURRENT_DATE - INTERVAL '7' DAY"
+        assert cache.key(daily, db_path, now=now) == cache.key(
+            daily, db_path, now=now + timedelta(hours=1)
+        )
+        assert cache.key(daily, db_path, now=now) != cache.key(
+            daily, db_path, now=now + timedelta(days=1)
+        )
+
+        hourly = (
+            "SELECT * FROM steam_kpis WHERE timestamp >= CURRENT_TIMESTAMP - INTERVAL '24' HOUR"
+        )
+        assert cache.key(hourly, db_path, now=now) != cache.key(
+            hourly, db_path, now=now + timedelta(hours=1)
+        )
+
+        # Queries without a clock reference ignore it
+        static = "SELECT * FROM steam_kpis"
+        assert cache.key(static, db_path, now=now) == cache.key(
+            static, db_path, now=now + timedelta(days=1)
+        )
+
+    def test_fetch_miss_and_hit(self, tmp_path: Path) -> None:
+        """Test that stored exports are copied back on fetch."""
+        cache = ExportCache(cache_dir=tmp_path / "cache")
+        export_path = tmp_path / "export.json"
+        export_path.write_text('[{"game_name": "Dota 2"}]')
+
+        assert cache.fetch("abc", tmp_path / "out.json") is False
+
+        cache.store("abc", export_path)
+        assert cache.fetch("abc", tmp_path / "out.json") is True
+        assert (tmp_path / "out.json").read_text() == '[{"game_name": "Dota 2"}]'
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Test that the oldest entries are evicted past max_bytes."""
+        cache = ExportCache(cache_dir=tmp_path / "cache", max_bytes=10)
+        export_path = tmp_path / "export.json"
+        export_path.write_text("x" * 6)
+
+        cache.store("old", export_path)
+        os.utime(tmp_path / "cache" / "old.json", (0, 0))
+        cache.store("new", export_path)
+
+        assert not (tmp_path / "cache" / "old.json").exists()
+        assert (tmp_path / "cache" / "new.json").exists()
+
+    def test_duckdb_export_served_from_cache(self, tmp_path: Path) -> None:
+        """Test that DuckDBManager reuses a cached export for the same query."""
+        cache = ExportCache(cache_dir=tmp_path / "cache")
+        sql = "SELECT * FROM steam_data"
+
+        with DuckDBManager(db_path=tmp_path / "test.db", export_cache=cache) as manager:
+            df = pd.DataFrame({"game_name": ["Counter-Strike 2"], "player_count": [1102182]})
+            manager.append_data(df, table_name="steam_data")
+            manager.export_to_json(tmp_path / "first.json", query=sql)
+
+            key = cache.key(sql, manager.db_path)
+            assert (tmp_path / "cache" / f"{key}.json").exists()
+
+            manager.export_to_json(tmp_path / "second.json", query=sql)
+
+        with open(tmp_path / "second.json") as f:
+            data = json.load(f)
+        assert data == [{"game_name": "Counter-Strike 2", "player_count": 1102182}]
+
+    def test_duckdb_export_misses_cache_after_date_rollover(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a CURRENT_DATE export is re-run once the clock passes midnight."""
+        clock = [datetime(2025, 10, 22, 23, 30)]
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):  # type: ignore[override]
+                return clock[0]
+
+        monkeypatch.setattr("python.storage.export_cache.datetime", FrozenDatetime)
+        cache = ExportCache(cache_dir=tmp_path / "cache")
+        sql = "SELECT COUNT(*) AS n FROM steam_data WHERE d >= CURRENT_DATE - INTERVAL '7' DAY"
+
+        with DuckDBManager(db_path=tmp_path / "test.db", export_cache=cache) as manager:
+            df = pd.DataFrame({"d": pd.to_datetime(["2025-10-20"])})
+            manager.append_data(df, table_name="steam_data")
+            manager.export_to_json(tmp_path / "first.json", query=sql)
+            manager.export_to_json(tmp_path / "second.json", query=sql)
+            assert len(list((tmp_path / "cache").glob("*.json"))) == 1  # Same day: hit
+
+            clock[0] += timedelta(hours=1)
+            manager.export_to_json(tmp_path / "third.json", query=sql)
+
+        assert len(list((tmp_path / "cache").glob("*.json"))) == 2  # Next day: miss
@@ -2,7 +2,7 @@
 
 import json
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 import requests
@@ -10,6 +10,21 @@ import requests
 from python.collectors.game_discovery import GameDiscovery
 
 
+@pytest.fixture(autouse=True)
+def mock_get(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Mock Session.get for every test; responses default to status 200."""
+    get = MagicMock()
+    get.return_value.status_code = 200
+    monkeypatch.setattr("python.collectors.game_discovery.requests.Session.get", get)
+    return get
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skip the rate-limiting delay between discovery sources."""
+    monkeypatch.setattr("python.collectors.game_discovery.time.sleep", lambda _: None)
+
+
 @pytest.fixture
 def temp_config_path(tmp_path: Path) -> Path:
     """Create a temporary config path for testing."""
@@ -119,7 +134,6 @@ class TestGameDiscovery:
         loaded_games = {int(k): v for k, v in data.items()}
         assert loaded_games == sample_games
 
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_discover_top_games_success(
         self,
         mock_get: MagicMock,
@@ -128,10 +142,7 @@ class TestGameDiscovery:
     ) -> None:
         """Test discovering top games from SteamSpy."""
         # Mock API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = steamspy_top_response
-        mock_get.return_value = mock_response
+        mock_get.return_value.json.return_value = steamspy_top_response
 
         # Discover games
         discovered = discovery.discover_top_games(limit=4)
@@ -143,15 +154,12 @@ class TestGameDiscovery:
         assert 1086940 in discovered
         assert discovered[1086940] == "Baldur's Gate 3"
 
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_discover_top_games_api_error(
         self, mock_get: MagicMock, discovery: GameDiscovery, capsys
     ) -> None:
         """Test handling API errors when discovering top games."""
         # Mock API error
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_get.return_value = mock_response
+        mock_get.return_value.status_code = 500
 
         # Discover games
         discovered = discovery.discover_top_games()
@@ -161,7 +169,6 @@ class TestGameDiscovery:
         captured = capsys.readouterr()
         assert "SteamSpy API returned status 500" in captured.out
 
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_discover_top_games_request_exception(
         self, mock_get: MagicMock, discovery: GameDiscovery, capsys
     ) -> None:
@@ -177,7 +184,6 @@ class TestGameDiscovery:
         captured = capsys.readouterr()
         assert "Error fetching top games" in captured.out
 
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_discover_featured_games_success(
         self,
         mock_get: MagicMock,
@@ -186,10 +192,7 @@ class TestGameDiscovery:
     ) -> None:
         """Test discovering featured games from Steam Store API."""
         # Mock API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = steam_featured_response
-        mock_get.return_value = mock_response
+        mock_get.return_value.json.return_value = steam_featured_response
 
         # Discover featured games
         discovered = discovery.discover_featured_games()
@@ -199,7 +202,6 @@ class TestGameDiscovery:
         assert 2694490 in discovered
         assert discovered[2694490] == "Path of Exile 2"
 
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_update_tracked_games_append_only(
         self,
         mock_get: MagicMock,
@@ -212,13 +214,10 @@ class TestGameDiscovery:
         discovery.save_tracked_games(sample_games)
 
         # Mock API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = steamspy_top_response
-        mock_get.return_value = mock_response
+        mock_get.return_value.json.return_value = steamspy_top_response
 
         # Update tracked games
-        updated = discovery.update_tracked_games(
+        updated, _ = discovery.update_tracked_games(
             include_top=True,
             include_featured=False,
             top_limit=4,
@@ -231,14 +230,12 @@ class TestGameDiscovery:
         assert 1086940 in updated  # New game
         assert 2358720 in updated  # New game
 
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_update_tracked_games_skip_duplicates(
         self,
         mock_get: MagicMock,
         discovery: GameDiscovery,
         sample_games: dict[int, str],
         steamspy_top_response: dict,
-        capsys,
     ) -> None:
         """Test that duplicate games are not added again."""
         # Save initial games
@@ -246,13 +243,10 @@ class TestGameDiscovery:
         initial_count = len(sample_games)
 
         # Mock API response (contains some games already in sample_games)
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = steamspy_top_response
-        mock_get.return_value = mock_response
+        mock_get.return_value.json.return_value = steamspy_top_response
 
         # Update tracked games
-        updated = discovery.update_tracked_games(
+        updated, stats = discovery.update_tracked_games(
             include_top=True,
             include_featured=False,
             top_limit=4,
@@ -263,12 +257,8 @@ class TestGameDiscovery:
         # steamspy response has 730, 570, 1086940, 2358720
         # So we should add 1086940 and 2358720 (2 new games)
         assert len(updated) == initial_count + 2
+        assert stats["added"] == 2
 
-        captured = capsys.readouterr()
-        # Verify that duplicate games were not printed as "Added"
-        assert captured.out.count("➕ Added") == 2
-
-    @patch("python.collectors.game_discovery.requests.Session.get")
     def test_update_tracked_games_both_sources(
         self,
         mock_get: MagicMock,
@@ -278,23 +268,20 @@ class TestGameDiscovery:
     ) -> None:
         """Test updating from both top games and featured games."""
 
-        # Mock API responses (both calls)
-        def mock_get_side_effect(*args, **kwargs):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
+        # Mock API responses (both calls), built once and picked by endpoint
+        steamspy_response = MagicMock(status_code=200)
+        steamspy_response.json.return_value = steamspy_top_response
+        featured_response = MagicMock(status_code=200)
+        featured_response.json.return_value = steam_featured_response
 
+        def mock_get_side_effect(url: str, **kwargs: object) -> MagicMock:
             # Check which endpoint is being called
-            if "steamspy.com" in str(args[0]) if args else "":
-                mock_response.json.return_value = steamspy_top_response
-            else:  # Steam Store featured API
-                mock_response.json.return_value = steam_featured_response
-
-            return mock_response
+            return steamspy_response if "steamspy.com" in url else featured_response
 
         mock_get.side_effect = mock_get_side_effect
 
         # Update tracked games from both sources
-        updated = discovery.update_tracked_games(
+        updated, _ = discovery.update_tracked_games(
             include_top=True,
             include_featured=True,
             top_limit=4,
@@ -0,0 +1,41 @@
+"""Tests for the GameMetadata record."""
+
+import pytest
+
+from python.models.game_metadata import GameMetadata
+
+
+class TestGameMetadata:
+    """Test suite for GameMetadata class."""
+
+    def test_defaults(self) -> None:
+        """Test that unset fields start empty and mutable defaults are not shared."""
+        first = GameMetadata(app_id=730, name="Counter-Strike 2")
+        second = GameMetadata(app_id=570)
+
+        first.tags["FPS"] = 1000
+
+        assert first.name == "Counter-Strike 2"
+        assert second.tags == {}
+        assert second.genres == []
+        assert second.metacritic_score is None
+        assert second.collected_at is None
+
+    def test_slots(self) -> None:
+        """Test that records reject attributes outside the schema."""
+        metadata = GameMetadata(app_id=730)
+
+        with pytest.raises(AttributeError):
+            metadata.unknown = 1  # type: ignore[attr-defined]
+
+    def test_to_dict(self) -> None:
+        """Test serialization to a plain dictionary."""
+        metadata = GameMetadata(app_id=570, name="Dota 2", genres=["Strategy"])
+
+        data = metadata.to_dict()
+
+        assert data["app_id"] == 570
+        assert data["genres"] == ["Strategy"]
+        assert data["tags"] == {}
+        assert data["collected_at"] is None
+        assert set(data) == set(GameMetadata.__dataclass_fields__)
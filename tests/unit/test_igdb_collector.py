@@ -0,0 +1,35 @@
+"""Tests for IGDB API collector."""
+
+from unittest.mock import MagicMock
+
+import responses
+from responses import matchers
+
+from python.collectors.igdb import IGDBCollector
+
+GAMES_URL = f"{IGDBCollector.API_BASE_URL}/games"
+
+
+class TestIGDBCollector:
+    """Test suite for IGDBCollector class."""
+
+    @responses.activate
+    def test_requests_go_through_session(self) -> None:
+        """Test that the token and API POSTs both reuse the collector's session."""
+        responses.post(IGDBCollector.AUTH_URL, json={"access_token": "token", "expires_in": 3600})
+        responses.post(
+            GAMES_URL,
+            json=[{"id": 1942, "name": "The Witcher 3"}],
+            match=[matchers.header_matcher({"Authorization": "Bearer token"})],
+        )
+
+        with IGDBCollector(client_id="id", client_secret="secret") as collector:
+            collector.session = MagicMock(wraps=collector.session)
+            games = collector.discover_popular_games(limit=1)
+
+        assert games == [{"id": 1942, "name": "The Witcher 3"}]
+        assert [c.args[0] for c in collector.session.post.call_args_list] == [
+            IGDBCollector.AUTH_URL,
+            GAMES_URL,
+        ]
+        collector.session.close.assert_called_once()
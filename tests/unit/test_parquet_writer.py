@@ -2,11 +2,49 @@
 
 from pathlib import Path
 
-import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import pytest
 
 from python.storage.parquet_writer import ParquetWriter
 
+# Disk-bound; kept on one xdist worker so the module-scoped partition fixtures are
+# written once rather than once per worker
+pytestmark = [pytest.mark.parquet_io, pytest.mark.xdist_group("parquet_io")]
+
+# ParquetWriter copies records into a DataFrame and never mutates them, so tests share these
+CS2_RECORD = {
+    "app_id": 730,
+    "game_name": "CS2",
+    "player_count": 100000,
+    "timestamp": "2025-01-22T14:00:00+00:00",
+}
+DOTA_RECORD = {
+    "app_id": 570,
+    "game_name": "Dota 2",
+    "player_count": 50000,
+    "timestamp": "2025-01-23T14:00:00+00:00",
+}
+
+
+@pytest.fixture(scope="module")
+def date_partitioned_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Two records on different days, written once per module partitioned by date."""
+    base = tmp_path_factory.mktemp("pq_date")
+    ParquetWriter(base_path=base).save([CS2_RECORD, DOTA_RECORD], partition_cols=["date"])
+    return base
+
+
+@pytest.fixture(scope="module")
+def date_game_partitioned_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Two games on one day, written once per module partitioned by date and game_id."""
+    base = tmp_path_factory.mktemp("pq_date_game")
+    same_day_dota = {**DOTA_RECORD, "timestamp": CS2_RECORD["timestamp"]}
+    ParquetWriter(base_path=base).save(
+        [CS2_RECORD, same_day_dota], partition_cols=["date", "game_id"]
+    )
+    return base
+
 
 class TestParquetWriter:
     """Test suite for ParquetWriter class."""
@@ -15,75 +53,28 @@ class TestParquetWriter:
         """Test saving a single game record to Parquet."""
         writer = ParquetWriter(base_path=tmp_path)
 
-        data = {
-            "app_id": 730,
-            "game_name": "Counter-Strike 2",
-            "player_count": 123456,
-            "timestamp": "2025-01-22T14:00:00+00:00",
-        }
-
-        writer.save([data])
+        files = writer.save([CS2_RECORD])
 
         # Verify file was created
-        files = list(tmp_path.rglob("*.parquet"))
         assert len(files) == 1
+        assert files[0].exists()
 
         # Verify data can be read back
-        df = pd.read_parquet(files[0])
-        assert len(df) == 1
-        assert df.iloc[0]["app_id"] == 730
-        assert df.iloc[0]["player_count"] == 123456
+        record = pq.read_table(files[0], columns=["app_id", "player_count"]).to_pydict()
+        assert record == {"app_id": [730], "player_count": [100000]}
 
-    def test_save_partitioned_by_date(self, tmp_path: Path) -> None:
+    def test_save_partitioned_by_date(self, date_partitioned_dir: Path) -> None:
         """Test that data is partitioned by date."""
-        writer = ParquetWriter(base_path=tmp_path)
-
-        data = [
-            {
-                "app_id": 730,
-                "game_name": "CS2",
-                "player_count": 100000,
-                "timestamp": "2025-01-22T14:00:00+00:00",
-            },
-            {
-                "app_id": 570,
-                "game_name": "Dota 2",
-                "player_count": 50000,
-                "timestamp": "2025-01-23T14:00:00+00:00",
-            },
-        ]
-
-        writer.save(data, partition_cols=["date"])
-
         # Verify partitioned structure
-        date_folders = list(tmp_path.glob("date=*"))
+        date_folders = list(date_partitioned_dir.glob("date=*"))
         assert len(date_folders) == 2
         assert any("2025-01-22" in str(f) for f in date_folders)
         assert any("2025-01-23" in str(f) for f in date_folders)
 
-    def test_save_partitioned_by_date_and_game(self, tmp_path: Path) -> None:
+    def test_save_partitioned_by_date_and_game(self, date_game_partitioned_dir: Path) -> None:
         """Test that data is partitioned by date and game_id."""
-        writer = ParquetWriter(base_path=tmp_path)
-
-        data = [
-            {
-                "app_id": 730,
-                "game_name": "CS2",
-                "player_count": 100000,
-                "timestamp": "2025-01-22T14:00:00+00:00",
-            },
-            {
-                "app_id": 570,
-                "game_name": "Dota 2",
-                "player_count": 50000,
-                "timestamp": "2025-01-22T14:00:00+00:00",
-            },
-        ]
-
-        writer.save(data, partition_cols=["date", "game_id"])
-
         # Verify nested partition structure
-        game_folders = list(tmp_path.rglob("game_id=*"))
+        game_folders = list(date_game_partitioned_dir.rglob("game_id=*"))
         assert len(game_folders) == 2
         assert any("game_id=730" in str(f) for f in game_folders)
         assert any("game_id=570" in str(f) for f in game_folders)
@@ -92,27 +83,15 @@ class TestParquetWriter:
         """Test appending data to existing partitions."""
         writer = ParquetWriter(base_path=tmp_path)
 
-        data1 = {
-            "app_id": 730,
-            "game_name": "CS2",
-            "player_count": 100000,
-            "timestamp": "2025-01-22T14:00:00+00:00",
-        }
-        data2 = {
-            "app_id": 730,
-            "game_name": "CS2",
-            "player_count": 110000,
-            "timestamp": "2025-01-22T15:00:00+00:00",
-        }
+        later = {**CS2_RECORD, "player_count": 110000, "timestamp": "2025-01-22T15:00:00+00:00"}
 
-        writer.save([data1], partition_cols=["date", "game_id"])
-        writer.save([data2], partition_cols=["date", "game_id"])
+        writer.save([CS2_RECORD], partition_cols=["date", "game_id"])
+        writer.save([later], partition_cols=["date", "game_id"])
 
-        # Verify both records exist
-        all_files = list(tmp_path.rglob("*.parquet"))
-        df = pd.concat([pd.read_parquet(f) for f in all_files])
-        assert len(df) == 2
-        assert set(df["player_count"].values) == {100000, 110000}
+        # Verify both records exist, scanning all partition files at once
+        table = ds.dataset(tmp_path, format="parquet").to_table(columns=["player_count"])
+        assert table.num_rows == 2
+        assert set(table.column("player_count").to_pylist()) == {100000, 110000}
 
     def test_validate_schema(self, tmp_path: Path) -> None:
         """Test that invalid data raises an error."""
@@ -138,36 +117,19 @@ class TestParquetWriter:
         """Test that writer creates necessary directories."""
         writer = ParquetWriter(base_path=tmp_path / "nested" / "path")
 
-        data = {
-            "app_id": 730,
-            "game_name": "CS2",
-            "player_count": 100000,
-            "timestamp": "2025-01-22T14:00:00+00:00",
-        }
-
-        writer.save([data])
+        writer.save([CS2_RECORD])
 
         assert (tmp_path / "nested" / "path").exists()
         files = list((tmp_path / "nested" / "path").rglob("*.parquet"))
         assert len(files) > 0
 
-    def test_add_metadata_columns(self, tmp_path: Path) -> None:
+    def test_add_metadata_columns(self, date_game_partitioned_dir: Path) -> None:
         """Test that date and game_id columns are added from timestamp and app_id."""
-        writer = ParquetWriter(base_path=tmp_path)
-
-        data = {
-            "app_id": 730,
-            "game_name": "CS2",
-            "player_count": 100000,
-            "timestamp": "2025-01-22T14:00:00+00:00",
-        }
-
-        writer.save([data], partition_cols=["date", "game_id"])
-
-        files = list(tmp_path.rglob("*.parquet"))
-        df = pd.read_parquet(files[0])
-
-        assert "date" in df.columns
-        assert "game_id" in df.columns
-        assert df.iloc[0]["date"] == "2025-01-22"
-        assert df.iloc[0]["game_id"] == 730
+        cs2_partition = date_game_partitioned_dir / "date=2025-01-22" / "game_id=730"
+        files = list(cs2_partition.glob("*.parquet"))
+        table = pq.read_table(files[0])
+
+        assert "date" in table.column_names
+        assert "game_id" in table.column_names
+        assert table.column("date")[0].as_py() == "2025-01-22"
+        assert table.column("game_id")[0].as_py() == 730
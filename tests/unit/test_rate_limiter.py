@@ -0,0 +1,55 @@
+"""Tests for the token bucket rate limiter."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from python.utils.rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Freeze time.monotonic at a value tests can advance; sleeping does not advance it."""
+    now = [1000.0]
+    monkeypatch.setattr("python.utils.rate_limiter.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def sleep(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Record sleeps instead of waiting."""
+    sleep = MagicMock(return_value=None)
+    monkeypatch.setattr("python.utils.rate_limiter.time.sleep", sleep)
+    return sleep
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket class."""
+
+    def test_burst_up_to_capacity(self, clock: list[float], sleep: MagicMock) -> None:
+        """Test that a full bucket serves capacity calls without waiting."""
+        limiter = TokenBucket(capacity=3, period=3.0)
+
+        assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        sleep.assert_not_called()
+
+    def test_waits_for_refill(self, clock: list[float], sleep: MagicMock) -> None:
+        """Test that calls beyond capacity wait one refill interval each."""
+        limiter = TokenBucket(capacity=2, period=2.0)  # 1 token per second
+        limiter.acquire()
+        limiter.acquire()
+
+        assert limiter.acquire() == pytest.approx(1.0)
+        assert limiter.acquire() == pytest.approx(2.0)  # Queued behind the previous caller
+        assert sleep.call_count == 2
+
+    def test_refills_over_time(self, clock: list[float], sleep: MagicMock) -> None:
+        """Test that elapsed time refills tokens, capped at capacity."""
+        limiter = TokenBucket(capacity=2, period=2.0)
+        limiter.acquire()
+        limiter.acquire()
+
+        clock[0] += 60.0  # Long idle period refills to capacity only
+
+        assert [limiter.acquire() for _ in range(2)] == [0.0, 0.0]
+        assert limiter.acquire() == pytest.approx(1.0)
@@ -1,89 +1,92 @@
 """Tests for Steam API collector."""
 
-from unittest.mock import Mock, patch
+from typing import Any
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 import requests
+import responses
+from responses import matchers
 
 from python.collectors.steam import SteamCollector
 
+PLAYER_COUNT_URL = f"{SteamCollector.API_BASE_URL}/ISteamUserStats/GetNumberOfCurrentPlayers/v1/"
 
-class TestSteamCollector:
-    """Test suite for SteamCollector class."""
-
-    def test_get_player_count_success(self) -> None:
-        """Test successful player count retrieval with realistic CS2 data."""
-        collector = SteamCollector()
 
-        with patch("requests.get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            # Real Steam API response format for CS2
-            mock_response.json.return_value = {"response": {"player_count": 1102182, "result": 1}}
-            mock_get.return_value = mock_response
+@pytest.fixture(autouse=True)
+def sleep(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace time.sleep so retry backoff and rate limiting return immediately."""
+    sleep = MagicMock(return_value=None)
+    monkeypatch.setattr("python.collectors.steam.time.sleep", sleep)
+    return sleep
 
-            result = collector.get_player_count(730)  # CS2
 
-            assert result == 1102182
-            mock_get.assert_called_once()
-            # Verify appid parameter was passed
-            call_kwargs = mock_get.call_args[1]
-            assert call_kwargs["params"]["appid"] == 730
+class TestSteamCollector:
+    """Test suite for SteamCollector class."""
 
+    @pytest.mark.parametrize(
+        ("app_id", "response_kwargs", "expected", "raises"),
+        [
+            # Real Steam API response format for CS2
+            pytest.param(
+                730,
+                {"json": {"response": {"player_count": 1102182, "result": 1}}},
+                1102182,
+                None,
+                id="success",
+            ),
+            # Real Steam API response for invalid/unknown app_id
+            pytest.param(
+                999999999, {"json": {"response": {"result": 42}}}, None, KeyError, id="missing_data"
+            ),
+            pytest.param(730, {"body": "not json"}, None, ValueError, id="invalid_json"),
+            pytest.param(
+                730, {"status": 503}, None, requests.exceptions.HTTPError, id="http_error"
+            ),
+        ],
+    )
+    @responses.activate
+    def test_get_player_count(
+        self,
+        app_id: int,
+        response_kwargs: dict[str, Any],
+        expected: int | None,
+        raises: type[Exception] | None,
+    ) -> None:
+        """Test player count retrieval and error handling for one API response."""
+        # Retries are covered by test_retry_*; here each response is handled exactly once
+        collector = SteamCollector(max_retries=0)
+
+        # Only matches when the appid parameter is passed
+        responses.get(
+            PLAYER_COUNT_URL,
+            match=[matchers.query_param_matcher({"appid": str(app_id)})],
+            **response_kwargs,
+        )
+
+        if raises is None:
+            assert collector.get_player_count(app_id) == expected
+        else:
+            with pytest.raises(raises):
+                collector.get_player_count(app_id)
+
+        assert len(responses.calls) == 1
+
+    @responses.activate
     def test_get_player_count_with_game_name(self) -> None:
         """Test player count returns game metadata with realistic Dota 2 data."""
         collector = SteamCollector()
 
-        with patch("requests.get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            # Real Steam API response format for Dota 2
-            mock_response.json.return_value = {"response": {"player_count": 620592, "result": 1}}
-            mock_get.return_value = mock_response
-
-            data = collector.get_game_data(570)  # Dota 2
-
-            assert data["app_id"] == 570
-            assert data["player_count"] == 620592
-            assert data["game_name"] == "Dota 2"
-            assert "timestamp" in data
-
-    def test_get_player_count_http_error(self) -> None:
-        """Test handling of HTTP errors."""
-        collector = SteamCollector()
-
-        with patch("requests.get") as mock_get:
-            mock_get.side_effect = requests.exceptions.RequestException("API Error")
+        # Real Steam API response format for Dota 2
+        responses.get(PLAYER_COUNT_URL, json={"response": {"player_count": 620592, "result": 1}})
 
-            with pytest.raises(requests.exceptions.RequestException):
-                collector.get_player_count(730)
-
-    def test_get_player_count_invalid_json(self) -> None:
-        """Test handling of invalid JSON response."""
-        collector = SteamCollector()
+        data = collector.get_game_data(570, include_kpis=False)  # Dota 2
 
-        with patch("requests.get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.side_effect = ValueError("Invalid JSON")
-            mock_get.return_value = mock_response
-
-            with pytest.raises(ValueError):
-                collector.get_player_count(730)
-
-    def test_get_player_count_missing_data(self) -> None:
-        """Test handling of missing player_count (real API response for invalid app_id)."""
-        collector = SteamCollector()
-
-        with patch("requests.get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            # Real Steam API response for invalid/unknown app_id
-            mock_response.json.return_value = {"response": {"result": 42}}
-            mock_get.return_value = mock_response
-
-            with pytest.raises(KeyError):
-                collector.get_player_count(999999999)  # Invalid app_id
+        assert data["steam_app_id"] == 570
+        assert data["player_count"] == 620592
+        assert data["game_name"] == "Dota 2"
+        assert "timestamp" in data
+        assert len(responses.calls) == 1
 
     def test_collect_top_games(self) -> None:
         """Test collecting data for multiple top games."""
@@ -103,6 +106,33 @@ class TestSteamCollector:
             assert mock_get_data.call_count == 3
             assert all("app_id" in game for game in results)
 
+    def test_collect_top_games_parallel(self) -> None:
+        """Test concurrent collection keeps tracked order and skips failures."""
+        collector = SteamCollector()
+        game_ids = list(collector.get_top_games())[:3]
+
+        def fake_game_data(app_id: int, include_kpis: bool = True) -> dict:
+            if app_id == game_ids[1]:
+                raise requests.exceptions.RequestException("API Error")
+            return {"steam_app_id": app_id, "player_count": 100000}
+
+        with patch.object(collector, "get_game_data", side_effect=fake_game_data):
+            results = collector.collect_top_games_parallel(limit=3, workers=3)
+
+        assert [game["steam_app_id"] for game in results] == [game_ids[0], game_ids[2]]
+
+    def test_collect_top_games_parallel_paces_kpi_requests(self, sleep: MagicMock) -> None:
+        """Test that concurrent KPI collection still starts games delay seconds apart."""
+        collector = SteamCollector()
+
+        with patch.object(collector, "get_game_data", return_value={"player_count": 1}):
+            results = collector.collect_top_games_parallel(limit=3, workers=3, delay=1.5)
+
+        assert len(results) == 3
+        # First game starts at once, the other two wait for their slot
+        waits = sorted(c.args[0] for c in sleep.call_args_list)
+        assert waits == [pytest.approx(1.5, abs=0.1), pytest.approx(3.0, abs=0.1)]
+
     def test_get_top_games_list(self) -> None:
         """Test that TOP_GAMES constant exists and has correct format."""
         collector = SteamCollector()
@@ -114,34 +144,31 @@ class TestSteamCollector:
         assert 570 in top_games  # Dota 2
         assert isinstance(top_games[730], str)  # Game name
 
-    def test_retry_on_failure(self) -> None:
+    @responses.activate
+    def test_retry_on_failure(self, sleep: MagicMock) -> None:
         """Test that collector retries on temporary failures."""
-        collector = SteamCollector(max_retries=3, retry_delay=0.01)
+        collector = SteamCollector(max_retries=3, retry_delay=1.0)
 
-        with patch("requests.get") as mock_get:
-            # Fail twice, then succeed with realistic CS2 data
-            mock_get.side_effect = [
-                requests.exceptions.RequestException("Timeout"),
-                requests.exceptions.RequestException("Network error"),
-                Mock(
-                    status_code=200,
-                    json=lambda: {"response": {"player_count": 1102182, "result": 1}},
-                ),
-            ]
+        # Fail twice, then succeed with realistic CS2 data; registrations are used in order
+        responses.get(PLAYER_COUNT_URL, body=requests.exceptions.Timeout("Timeout"))
+        responses.get(PLAYER_COUNT_URL, body=requests.exceptions.ConnectionError("Network error"))
+        responses.get(PLAYER_COUNT_URL, json={"response": {"player_count": 1102182, "result": 1}})
 
-            result = collector.get_player_count(730)
+        result = collector.get_player_count(730)
 
-            assert result == 1102182
-            assert mock_get.call_count == 3  # 2 failures + 1 success
+        assert result == 1102182
+        assert len(responses.calls) == 3  # 2 failures + 1 success
+        assert sleep.call_args_list == [call(1.0), call(2.0)]  # Exponential backoff
 
-    def test_retry_exhausted(self) -> None:
+    @responses.activate
+    def test_retry_exhausted(self, sleep: MagicMock) -> None:
         """Test that collector raises exception after max retries."""
-        collector = SteamCollector(max_retries=2, retry_delay=0.01)
+        collector = SteamCollector(max_retries=2, retry_delay=1.0)
 
-        with patch("requests.get") as mock_get:
-            mock_get.side_effect = requests.exceptions.RequestException("Persistent error")
+        responses.get(PLAYER_COUNT_URL, status=500)
 
-            with pytest.raises(requests.exceptions.RequestException):
-                collector.get_player_count(730)
+        with pytest.raises(requests.exceptions.RequestException):
+            collector.get_player_count(730)
 
-            assert mock_get.call_count == 3  # Initial + 2 retries
+        assert len(responses.calls) == 3  # Initial + 2 retries
+        assert sleep.call_count == 2  # No sleep after the last attempt
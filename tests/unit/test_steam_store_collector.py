@@ -1,11 +1,24 @@
 """Tests for Steam Store API collector."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
+import responses
+from responses import matchers
 
 from python.collectors.steam_store import SteamStoreCollector
 
+STORE_URL = SteamStoreCollector.store_api_base
+STEAMSPY_URL = SteamStoreCollector.steamspy_api_base
+
+
+@pytest.fixture
+def sleep(monkeypatch):
+    """Replace time.sleep so the rate-limiting delay returns immediately."""
+    sleep = MagicMock(return_value=None)
+    monkeypatch.setattr("python.collectors.steam_store.time.sleep", sleep)
+    return sleep
+
 
 @pytest.fixture
 def sample_store_response():
@@ -72,57 +85,78 @@ class TestSteamStoreCollector:
         assert hasattr(collector, "store_api_base")
         assert hasattr(collector, "steamspy_api_base")
 
-    @patch("requests.Session.get")
-    def test_get_game_details_success(self, mock_get, sample_store_response):
+        adapter = collector.session.get_adapter(collector.store_api_base)
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] >= 16
+        assert adapter.max_retries.total == 3
+        assert collector.store_limiter.rate == pytest.approx(200 / 300)
+        assert collector.steamspy_limiter.rate == pytest.approx(1.0)
+
+        # requests advertises Brotli once the brotli package (a dependency) is importable
+        assert "br" in collector.session.headers["Accept-Encoding"]
+
+    @responses.activate
+    def test_get_game_details_success(self, sample_store_response):
         """Test successful game details retrieval."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = sample_store_response
-        mock_get.return_value = mock_response
+        responses.get(
+            STORE_URL,
+            json=sample_store_response,
+            match=[matchers.query_param_matcher({"appids": "730", "l": "english"})],
+        )
 
         collector = SteamStoreCollector()
         details = collector.get_game_details(730)
 
         assert details is not None
-        assert details["app_id"] == 730
-        assert details["name"] == "Counter-Strike 2"
-        assert details["developers"] == ["Valve"]
-        assert details["publishers"] == ["Valve"]
-        assert details["is_free"] is True
-        assert details["metacritic_score"] == 81
-
-    @patch("requests.Session.get")
-    def test_get_game_details_api_failure(self, mock_get):
+        assert details.app_id == 730
+        assert details.name == "Counter-Strike 2"
+        assert details.developers == ["Valve"]
+        assert details.publishers == ["Valve"]
+        assert details.is_free is True
+        assert details.metacritic_score == 81
+
+        # Second lookup is served from the cache
+        assert collector.get_game_details(730) == details
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_get_game_details_cache_disabled(self, sample_store_response):
+        """Test that cache_ttl=0 fetches game details on every call."""
+        responses.get(STORE_URL, json=sample_store_response)
+
+        collector = SteamStoreCollector(cache_ttl=0)
+        collector.get_game_details(730)
+        collector.get_game_details(730)
+
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_get_game_details_api_failure(self):
         """Test handling of API failure."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
+        responses.get(STORE_URL, status=404)
 
         collector = SteamStoreCollector()
         details = collector.get_game_details(999999)
 
         assert details is None
 
-    @patch("requests.Session.get")
-    def test_get_game_details_invalid_response(self, mock_get):
+    @responses.activate
+    def test_get_game_details_invalid_response(self):
         """Test handling of invalid JSON response."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = ValueError("Invalid JSON")
-        mock_get.return_value = mock_response
+        responses.get(STORE_URL, body="<html>Service Unavailable</html>")
 
         collector = SteamStoreCollector()
         details = collector.get_game_details(730)
 
         assert details is None
 
-    @patch("requests.Session.get")
-    def test_get_game_tags_success(self, mock_get, sample_steamspy_response):
+    @responses.activate
+    def test_get_game_tags_success(self, sample_steamspy_response):
         """Test successful tags retrieval from SteamSpy."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = sample_steamspy_response
-        mock_get.return_value = mock_response
+        responses.get(
+            STEAMSPY_URL,
+            json=sample_steamspy_response,
+            match=[matchers.query_param_matcher({"request": "appdetails", "appid": "730"})],
+        )
 
         collector = SteamStoreCollector()
         tags = collector.get_game_tags(730)
@@ -133,129 +167,104 @@ class TestSteamStoreCollector:
         assert "Multiplayer" in tags
         assert len(tags) >= 3
 
-    @patch("requests.Session.get")
-    def test_get_game_tags_failure(self, mock_get):
+    @responses.activate
+    def test_get_game_tags_failure(self):
         """Test handling of SteamSpy API failure."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_get.return_value = mock_response
+        responses.get(STEAMSPY_URL, status=500)
 
         collector = SteamStoreCollector()
         tags = collector.get_game_tags(730)
 
         assert tags == {}
 
-    @patch("requests.Session.get")
-    def test_collect_full_metadata(self, mock_get, sample_store_response, sample_steamspy_response):
+    @responses.activate
+    def test_collect_full_metadata(self, sample_store_response, sample_steamspy_response):
         """Test collecting full metadata (details + tags)."""
-        # Mock both API calls
-        call_count = [0]
-
-        def side_effect(*args, **kwargs):
-            response = MagicMock()
-            response.status_code = 200
-            # First call is Steam Store, second is SteamSpy
-            if call_count[0] == 0:
-                response.json.return_value = sample_store_response
-            else:
-                response.json.return_value = sample_steamspy_response
-            call_count[0] += 1
-            return response
-
-        mock_get.side_effect = side_effect
+        # Both APIs are queried concurrently; responses matches each by URL
+        responses.get(STORE_URL, json=sample_store_response)
+        responses.get(STEAMSPY_URL, json=sample_steamspy_response)
 
         collector = SteamStoreCollector()
         metadata = collector.collect_full_metadata(730)
 
         assert metadata is not None
-        assert metadata["app_id"] == 730
-        assert metadata["name"] == "Counter-Strike 2"
-        assert "tags" in metadata
-        assert "FPS" in metadata["tags"]
-        assert "developers" in metadata
-        assert "genres" in metadata
-
-    @patch("requests.Session.get")
-    @patch("time.sleep")  # Mock sleep to speed up test
+        assert metadata.app_id == 730
+        assert metadata.name == "Counter-Strike 2"
+        assert metadata.tags == sample_steamspy_response["tags"]
+        assert metadata.developers == ["Valve"]
+        assert metadata.genres == ["Action"]
+        assert metadata.collected_at is not None
+        assert len(responses.calls) == 2
+
+    @responses.activate
     def test_collect_top_games_metadata(
-        self, mock_sleep, mock_get, sample_store_response, sample_steamspy_response
+        self, sleep, sample_store_response, sample_steamspy_response
     ):
         """Test collecting metadata for multiple games."""
+        dota_store_response = {
+            "570": {
+                "success": True,
+                "data": {
+                    "type": "game",
+                    "name": "Dota 2",
+                    "steam_appid": 570,
+                    "required_age": 0,
+                    "is_free": True,
+                    "detailed_description": "Dota 2 is a multiplayer...",
+                    "about_the_game": "Dota 2 is...",
+                    "short_description": "Dota 2 is...",
+                    "developers": ["Valve"],
+                    "publishers": ["Valve"],
+                    "platforms": {"windows": True, "mac": True, "linux": True},
+                    "metacritic": {
+                        "score": 90,
+                        "url": "https://www.metacritic.com/game/pc/dota-2",
+                    },
+                    "categories": [{"id": 1, "description": "Multi-player"}],
+                    "genres": [{"id": "1", "description": "Strategy"}],
+                    "release_date": {"coming_soon": False, "date": "9 Jul, 2013"},
+                    "price_overview": {
+                        "currency": "USD",
+                        "initial": 0,
+                        "final": 0,
+                        "discount_percent": 0,
+                    },
+                },
+            }
+        }
+        dota_steamspy_response = {
+            "appid": 570,
+            "name": "Dota 2",
+            "tags": {"MOBA": 1000, "Strategy": 950, "Multiplayer": 900},
+        }
 
-        def side_effect(*args, **kwargs):
-            response = MagicMock()
-            response.status_code = 200
-
-            # Check if this is a Steam Store or SteamSpy call based on URL
-            url = args[0] if args else kwargs.get("url", "")
-            params = kwargs.get("params", {})
-
-            if "steampowered.com" in url:
-                # Steam Store API call - return response based on app_id
-                app_id = params.get("appids")
-                if app_id == 730:
-                    response.json.return_value = sample_store_response
-                elif app_id == 570:
-                    # Create response for Dota 2
-                    response.json.return_value = {
-                        "570": {
-                            "success": True,
-                            "data": {
-                                "type": "game",
-                                "name": "Dota 2",
-                                "steam_appid": 570,
-                                "required_age": 0,
-                                "is_free": True,
-                                "detailed_description": "Dota 2 is a multiplayer...",
-                                "about_the_game": "Dota 2 is...",
-                                "short_description": "Dota 2 is...",
-                                "developers": ["Valve"],
-                                "publishers": ["Valve"],
-                                "platforms": {"windows": True, "mac": True, "linux": True},
-                                "metacritic": {
-                                    "score": 90,
-                                    "url": "https://www.metacritic.com/game/pc/dota-2",
-                                },
-                                "categories": [{"id": 1, "description": "Multi-player"}],
-                                "genres": [{"id": "1", "description": "Strategy"}],
-                                "release_date": {"coming_soon": False, "date": "9 Jul, 2013"},
-                                "price_overview": {
-                                    "currency": "USD",
-                                    "initial": 0,
-                                    "final": 0,
-                                    "discount_percent": 0,
-                                },
-                            },
-                        }
-                    }
-            else:
-                # SteamSpy API call
-                app_id = params.get("appid")
-                if app_id == 730:
-                    response.json.return_value = sample_steamspy_response
-                elif app_id == 570:
-                    response.json.return_value = {
-                        "appid": 570,
-                        "name": "Dota 2",
-                        "tags": {
-                            "MOBA": 1000,
-                            "Strategy": 950,
-                            "Multiplayer": 900,
-                        },
-                    }
-
-            return response
-
-        mock_get.side_effect = side_effect
+        # One canned response per endpoint and app, matched on the app ID parameter
+        for app_id, store_response, steamspy_response in [
+            (730, sample_store_response, sample_steamspy_response),
+            (570, dota_store_response, dota_steamspy_response),
+        ]:
+            responses.get(
+                STORE_URL,
+                json=store_response,
+                match=[matchers.query_param_matcher({"appids": str(app_id)}, strict_match=False)],
+            )
+            responses.get(
+                STEAMSPY_URL,
+                json=steamspy_response,
+                match=[matchers.query_param_matcher({"appid": str(app_id)}, strict_match=False)],
+            )
 
         collector = SteamStoreCollector()
         game_ids = [730, 570]  # CS2 and Dota 2
         metadata_list = collector.collect_top_games_metadata(game_ids)
 
         assert len(metadata_list) == 2
-        assert all("app_id" in meta for meta in metadata_list)
-        assert all("name" in meta for meta in metadata_list)
-        assert all("tags" in meta for meta in metadata_list)
+        assert [meta.app_id for meta in metadata_list] == game_ids  # Input order kept
+        sleep.assert_called_once_with(1.5)  # Only between starting the two games
+        assert [meta.name for meta in metadata_list] == ["Counter-Strike 2", "Dota 2"]
+        assert metadata_list[0].tags == sample_steamspy_response["tags"]
+        assert metadata_list[1].tags == dota_steamspy_response["tags"]
+        assert all(meta.collected_at is not None for meta in metadata_list)
 
     def test_extract_genres(self, sample_store_response):
         """Test genre extraction from API response."""
@@ -285,3 +294,12 @@ class TestSteamStoreCollector:
         assert price_info["currency"] == "USD"
         assert price_info["price"] == 0
         assert price_info["is_free"] is True
+
+    def test_context_manager_releases_resources(self):
+        """Test that leaving the with block stops the tag executor and closes the session."""
+        with SteamStoreCollector() as collector:
+            collector.session = MagicMock(wraps=collector.session)
+
+        collector.session.close.assert_called_once()
+        with pytest.raises(RuntimeError):
+            collector._tags_executor.submit(collector.get_game_tags, 730)